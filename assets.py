@@ -0,0 +1,120 @@
+import logging
+import os
+import struct
+import time
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+# Cache file layout: header, then the pixels as raw RGBA rows
+CACHE_MAGIC: bytes = b"FJAC"
+CACHE_HEADER: struct.Struct = struct.Struct("<4sHH")  # magic, width, height
+
+
+class Sprite:
+    """An image scaled to its drawn size, plus its horizontal mirror."""
+
+    __slots__ = ("image", "flipped", "converted")
+
+    def __init__(self, image: pygame.Surface, converted: bool):
+        self.image: pygame.Surface = image
+        self.flipped: pygame.Surface = pygame.transform.flip(image, True, False)
+        self.converted: bool = converted
+
+
+class AssetManager:
+    """Loads each image once, scaled, converted for the display and pre-flipped.
+
+    Surfaces are converted with convert_alpha() as soon as a window exists;
+    anything loaded before that is converted on its next request. With a
+    cache directory, the scaled pixels are also written to disk, so a
+    restart skips decoding and scaling the full-size source image. Cache
+    files are named after the source's modification time and become stale
+    on their own when the image changes.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir: Optional[str] = cache_dir
+        self._sprites: Dict[Tuple[str, int, int], Sprite] = {}
+
+    def sprite(self, path: str, size: Tuple[int, int]) -> Sprite:
+        key: Tuple[str, int, int] = (path, size[0], size[1])
+        sprite: Optional[Sprite] = self._sprites.get(key)
+        display_ready: bool = pygame.display.get_surface() is not None
+        if sprite is not None and (sprite.converted or not display_ready):
+            return sprite
+
+        start: float = time.perf_counter()
+        image: pygame.Surface = (
+            sprite.image if sprite is not None else self._load_scaled(path, size)
+        )
+        if display_ready:
+            image = image.convert_alpha()
+        sprite = Sprite(image, display_ready)
+        self._sprites[key] = sprite
+        logging.debug(
+            "Prepared asset %s at %dx%d in %.1f ms",
+            path,
+            size[0],
+            size[1],
+            (time.perf_counter() - start) * 1000,
+        )
+        return sprite
+
+    def _cache_path(self, path: str, size: Tuple[int, int]) -> str:
+        stem: str = os.path.splitext(os.path.basename(path))[0]
+        mtime: int = os.stat(path).st_mtime_ns
+        return os.path.join(self.cache_dir, f"{stem}-{size[0]}x{size[1]}-{mtime}.rgba")
+
+    def _load_scaled(self, path: str, size: Tuple[int, int]) -> pygame.Surface:
+        cache_path: Optional[str] = None
+        if self.cache_dir is not None:
+            cache_path = self._cache_path(path, size)
+            image: Optional[pygame.Surface] = self._read_cache(cache_path, size)
+            if image is not None:
+                return image
+
+        image = pygame.transform.scale(pygame.image.load(path), size)
+
+        if cache_path is not None:
+            self._write_cache(cache_path, image)
+        return image
+
+    @staticmethod
+    def _read_cache(cache_path: str, size: Tuple[int, int]) -> Optional[pygame.Surface]:
+        try:
+            with open(cache_path, "rb") as file:
+                data: bytes = file.read()
+        except OSError:
+            return None
+        if len(data) < CACHE_HEADER.size:
+            return None
+        magic, width, height = CACHE_HEADER.unpack_from(data)
+        if magic != CACHE_MAGIC or (width, height) != size:
+            return None
+        pixels: bytes = data[CACHE_HEADER.size:]
+        if len(pixels) != width * height * 4:
+            return None
+        return pygame.image.frombytes(pixels, size, "RGBA")
+
+    @staticmethod
+    def _write_cache(cache_path: str, image: pygame.Surface) -> None:
+        width, height = image.get_size()
+        data: bytes = CACHE_HEADER.pack(CACHE_MAGIC, width, height) + pygame.image.tobytes(
+            image, "RGBA"
+        )
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Write to a temporary name first so a crash never leaves a half-written cache file
+            temporary_path: str = f"{cache_path}.tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(data)
+            os.replace(temporary_path, cache_path)
+        except OSError as error:
+            logging.warning("Could not write asset cache %s: %s", cache_path, error)
+
+    def clear(self) -> None:
+        self._sprites.clear()
+
+
+assets: AssetManager = AssetManager()
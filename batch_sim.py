@@ -0,0 +1,302 @@
+import time
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+import constants
+from constants import (
+    GENERATION_LOOKAHEAD,
+    PLATFORM_HEIGHT,
+    PLATFORM_WIDTH,
+    PLAYER_SIZE,
+    PLAYER_SPEED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
+from world import World
+
+CAMERA_SMOOTHING: float = 0.05  # Same value as Camera.offset_smoothing
+
+
+class BatchSimulator:
+    """Steps many independent game sessions at once as struct-of-arrays.
+
+    Every session follows exactly the rules of GameState.step(): given the
+    same seed and the same per-tick inputs it produces the same positions,
+    camera offset and score. Physics, collision, culling and scoring run as
+    NumPy operations over all sessions; only platform generation goes through
+    a per-session World, one chunk at a time.
+
+    Platforms of a session form a stream ordered by creation (and therefore
+    by strictly decreasing y), kept in a per-session ring buffer. The live
+    window is [lo, hi); stream entries in [hi, gen) are pre-generated but not
+    yet added by the game. Because consecutive platforms are at least
+    MIN_PLATFORM_DISTANCE apart, which is more than the player and platform
+    heights combined, only the platforms crossed by the player's vertical
+    sweep need testing, and a per-session cursor finds them without a scan.
+    """
+
+    def __init__(self, seeds: Sequence[int], high_score: int = 0):
+        n: int = len(seeds)
+        self.size: int = n
+        self._rows: np.ndarray = np.arange(n)
+        self._worlds: List[World] = [World(SCREEN_WIDTH, SCREEN_HEIGHT, seed) for seed in seeds]
+
+        self._capacity: int = 64
+        self.platform_x: np.ndarray = np.zeros((n, self._capacity), dtype=np.int64)
+        self.platform_y: np.ndarray = np.zeros((n, self._capacity), dtype=np.int64)
+        self.lo: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.hi: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.gen: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.offset_y: np.ndarray = np.zeros(n, dtype=np.float64)
+
+        self.x: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.y: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.y_change: np.ndarray = np.zeros(n, dtype=np.float64)
+        self.cursor: np.ndarray = np.zeros(n, dtype=np.int64)
+
+        self.score: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.high_score: np.ndarray = np.full(n, high_score, dtype=np.int64)
+        self.passed_platforms: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.ticks: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.last_jumped: np.ndarray = np.full(n, -1, dtype=np.int64)
+        self.last_jumped_top: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.last_passed: np.ndarray = np.full(n, -1, dtype=np.int64)
+
+        self._start(self._rows)
+
+    def _start(self, rows: np.ndarray) -> None:
+        # Put the given sessions in their initial state, with the platforms
+        # from the starting one up to the lookahead
+        self.lo[rows] = 0
+        self.hi[rows] = 0
+        self.gen[rows] = 0
+        self.offset_y[rows] = 0.0
+        self._generate(rows)
+        self.hi[rows] += 1
+        starting: np.ndarray = np.zeros(self.size, dtype=bool)
+        starting[rows] = True
+        self._populate(starting)
+
+        self.x[rows] = SCREEN_WIDTH // 2
+        self.y[rows] = self.platform_y[rows, 1] - PLAYER_SIZE
+        self.y_change[rows] = 0.0
+        self.cursor[rows] = 0
+        self.score[rows] = 0
+        self.passed_platforms[rows] = 0
+        self.ticks[rows] = 0
+        self.last_jumped[rows] = -1
+        self.last_jumped_top[rows] = 0
+        self.last_passed[rows] = -1
+
+    def restart(self, rows: np.ndarray, seeds: Sequence[int]) -> None:
+        """Start new sessions with the given seeds in the given rows; high scores are kept."""
+        for i, seed in zip(rows.tolist(), seeds):
+            self._worlds[i] = World(SCREEN_WIDTH, SCREEN_HEIGHT, seed)
+        self._start(rows)
+
+    @property
+    def game_over(self) -> np.ndarray:
+        return self.y > self.offset_y + SCREEN_HEIGHT
+
+    def _platform_top(self, k: np.ndarray) -> np.ndarray:
+        return self.platform_y[self._rows, k & (self._capacity - 1)]
+
+    def _platform_left(self, k: np.ndarray) -> np.ndarray:
+        return self.platform_x[self._rows, k & (self._capacity - 1)]
+
+    def _grow(self, needed: int) -> None:
+        capacity: int = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        platform_x: np.ndarray = np.zeros((self.size, capacity), dtype=np.int64)
+        platform_y: np.ndarray = np.zeros((self.size, capacity), dtype=np.int64)
+        for i in range(self.size):
+            k: np.ndarray = np.arange(self.lo[i], self.gen[i])
+            platform_x[i, k & (capacity - 1)] = self.platform_x[i, k & (self._capacity - 1)]
+            platform_y[i, k & (capacity - 1)] = self.platform_y[i, k & (self._capacity - 1)]
+        self.platform_x = platform_x
+        self.platform_y = platform_y
+        self._capacity = capacity
+
+    def _generate(self, rows: np.ndarray) -> None:
+        # Append the next chunk of each given session's World to its stream
+        chunks: List[List[Tuple[int, int]]] = [self._worlds[i].take_chunk() for i in rows.tolist()]
+        needed: int = max(
+            int(self.gen[i] - self.lo[i]) + len(chunk) for i, chunk in zip(rows.tolist(), chunks)
+        )
+        if needed > self._capacity:
+            self._grow(needed)
+        mask: int = self._capacity - 1
+        for i, chunk in zip(rows.tolist(), chunks):
+            start: int = int(self.gen[i])
+            slots: np.ndarray = np.arange(start, start + len(chunk)) & mask
+            self.platform_x[i, slots] = [p_x for p_x, _ in chunk]
+            self.platform_y[i, slots] = [p_y for _, p_y in chunk]
+            self.gen[i] = start + len(chunk)
+
+    def _populate(self, active: np.ndarray) -> None:
+        # Same rule as World.populate(): add platforms until the highest reaches the lookahead
+        top: np.ndarray = self.offset_y - GENERATION_LOOKAHEAD
+        while True:
+            short: np.ndarray = active & (self._platform_top(self.hi - 1) > top)
+            if not short.any():
+                break
+            exhausted: np.ndarray = np.flatnonzero(short & (self.gen <= self.hi))
+            if exhausted.size:
+                self._generate(exhausted)
+            self.hi += short
+
+    def _seek_cursor(self, bottom: np.ndarray) -> None:
+        # Move each cursor to the lowest live platform whose top is above the player's bottom
+        while True:
+            down: np.ndarray = (self.cursor > self.lo) & (
+                self._platform_top(self.cursor - 1) < bottom
+            )
+            if not down.any():
+                break
+            self.cursor -= down
+        while True:
+            up: np.ndarray = (self.cursor < self.hi) & (
+                self._platform_top(self.cursor) >= bottom
+            )
+            if not up.any():
+                break
+            self.cursor += up
+
+    def platforms_around(self, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (left, top, live) of `count` consecutive platforms per session, lowest first.
+
+        The window is centred on the lowest platform above the player's feet,
+        the same platforms as PlatformIndex.around(); slots past the highest
+        live platform are marked not live.
+        """
+        np.maximum(self.cursor, self.lo, out=self.cursor)
+        self._seek_cursor(self.y + PLAYER_SIZE)
+        start: np.ndarray = np.clip(
+            self.cursor - count // 2, self.lo, np.maximum(self.hi - count, self.lo)
+        )
+        k: np.ndarray = start[:, None] + np.arange(count)
+        slots: np.ndarray = k & (self._capacity - 1)
+        rows: np.ndarray = self._rows[:, None]
+        return self.platform_x[rows, slots], self.platform_y[rows, slots], k < self.hi[:, None]
+
+    def step(self, directions: np.ndarray) -> None:
+        """Advance every session that is not over by one tick."""
+        active: np.ndarray = ~self.game_over
+        self.ticks += active
+
+        # Scoring, against the lowest live platform (platforms.lowest() in GameState.step())
+        bottom: np.ndarray = self.y + PLAYER_SIZE
+        scored: np.ndarray = (
+            active
+            & (self.last_jumped >= 0)
+            & (bottom <= self.last_jumped_top)
+            & (self.last_jumped_top < self._platform_top(self.lo))
+            & (self.last_passed != self.last_jumped)
+        )
+        self.passed_platforms += scored
+        self.last_passed = np.where(scored, self.last_jumped, self.last_passed)
+        self.score = np.where(scored, self.passed_platforms, self.score)
+        np.maximum(self.high_score, self.score, out=self.high_score)
+
+        # Gravity and movement; Rect.move_ip() truncates towards zero
+        previous_bottom: np.ndarray = self.y + PLAYER_SIZE
+        self.y_change += np.where(active, constants.GRAVITY, 0.0)  # Read per tick like GameState.step()
+        self.y += np.trunc(self.y_change).astype(np.int64) * active
+        self.x += np.asarray(directions, dtype=np.int64) * PLAYER_SPEED * active
+        np.clip(self.x, 0, SCREEN_WIDTH - PLAYER_SIZE, out=self.x)
+
+        self._seek_cursor(self.y + PLAYER_SIZE)
+
+        # Swept collision: candidates are the platforms from the cursor up to the last one
+        # reaching below the top of the sweep, tried highest first like GameState.step()
+        sweep_top: np.ndarray = np.minimum(self.y, previous_bottom)
+        end: np.ndarray = self.cursor.copy()
+        while True:
+            below: np.ndarray = (end < self.hi) & (
+                self._platform_top(end) + PLATFORM_HEIGHT > sweep_top
+            )
+            if not below.any():
+                break
+            end += below
+        candidate: np.ndarray = end - 1
+        pending: np.ndarray = active & (self.y_change > 0)
+        collided: np.ndarray = np.zeros(self.size, dtype=bool)
+        landed_on: np.ndarray = np.zeros(self.size, dtype=np.int64)
+        while True:
+            pending &= candidate >= self.cursor
+            if not pending.any():
+                break
+            platform_left: np.ndarray = self._platform_left(candidate)
+            hit: np.ndarray = (
+                pending
+                & (self.x < platform_left + PLATFORM_WIDTH)
+                & (self.x + PLAYER_SIZE > platform_left)
+            )
+            collided |= hit
+            landed_on = np.where(hit, candidate, landed_on)
+            pending &= ~hit
+            candidate -= 1
+        platform_top: np.ndarray = self._platform_top(landed_on)
+        self.y = np.where(collided, platform_top - PLAYER_SIZE - 1, self.y)
+        self.y_change = np.where(collided, float(constants.JUMP_VELOCITY), self.y_change)
+        higher: np.ndarray = collided & (
+            (self.last_jumped < 0) | (platform_top < self.last_jumped_top)
+        )
+        self.last_jumped = np.where(higher, landed_on, self.last_jumped)
+        self.last_jumped_top = np.where(higher, platform_top, self.last_jumped_top)
+
+        # Keep platforms generated up to a fixed distance above the camera
+        self._populate(active)
+
+        # Cull platforms below the screen; they always form a prefix of the window
+        limit: np.ndarray = self.offset_y + SCREEN_HEIGHT
+        while True:
+            culled: np.ndarray = (
+                active & (self.lo < self.hi) & (self._platform_top(self.lo) >= limit)
+            )
+            if not culled.any():
+                break
+            self.lo += culled
+        np.maximum(self.cursor, self.lo, out=self.cursor)
+
+        # Camera
+        target_offset_y: np.ndarray = self.y + PLAYER_SIZE // 2 - SCREEN_HEIGHT // 2
+        self.offset_y = np.where(
+            active,
+            self.offset_y + (target_offset_y - self.offset_y) * CAMERA_SMOOTHING,
+            self.offset_y,
+        )
+
+    def run(
+        self, policy: Callable[["BatchSimulator"], np.ndarray], max_ticks: int
+    ) -> None:
+        """Step all sessions until every one is over or max_ticks is reached."""
+        for _ in range(max_ticks):
+            if self.game_over.all():
+                break
+            self.step(policy(self))
+
+
+def benchmark(size: int, ticks: int = 1000) -> float:
+    """Return simulated session-steps per second for a batch of the given size."""
+    rng: np.random.Generator = np.random.default_rng(0)
+    sim: BatchSimulator = BatchSimulator(list(range(size)))
+    # Steer towards the platform above, with some noise so sessions differ
+    def policy(s: BatchSimulator) -> np.ndarray:
+        target: np.ndarray = s._platform_left(s.cursor) + PLATFORM_WIDTH // 2
+        centre: np.ndarray = s.x + PLAYER_SIZE // 2
+        directions: np.ndarray = np.sign(target - centre)
+        noise: np.ndarray = rng.random(s.size) < 0.1
+        return np.where(noise, rng.integers(-1, 2, s.size), directions)
+
+    start: float = time.perf_counter()
+    sim.run(policy, ticks)
+    elapsed: float = time.perf_counter() - start
+    return int(sim.ticks.sum()) / elapsed
+
+
+if __name__ == "__main__":
+    for n in (1, 100, 10_000):
+        print(f"N={n}: {benchmark(n):,.0f} steps/sec")
@@ -0,0 +1,260 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Benchmarks never open a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from camera import Camera
+from constants import LIGHT_BLUE, SCREEN_HEIGHT, SCREEN_WIDTH
+from display import SCALE_MODES, Display
+from game_state import GameState
+from high_score_label import HighScoreLabel
+from main import load_localized_strings, wrap_text
+from renderer import Renderer
+from snapshot import restore, snapshot
+from text_cache import clear_caches, get_font
+from world import World
+
+# Scripted inputs: (direction, ticks) segments repeated for the whole session
+SCRIPTS: Dict[str, List[Tuple[int, int]]] = {
+    "idle": [(0, 1)],
+    "zigzag": [(1, 40), (0, 20), (-1, 40), (0, 20)],
+    "sweep": [(-1, 90), (1, 90)],
+}
+
+# Window sizes the fixed-size picture is scaled up to
+WINDOW_SIZES: Dict[str, Tuple[int, int]] = {
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+
+def scripted_directions(script: List[Tuple[int, int]]) -> Iterator[int]:
+    return itertools.cycle(
+        [direction for direction, ticks in script for _ in range(ticks)]
+    )
+
+
+def run_session(
+    script: List[Tuple[int, int]],
+    frames: int,
+    screen: Optional[pygame.Surface],
+    present: Optional[Callable[..., None]] = None,
+) -> float:
+    """Play seeded sessions for the given number of frames and return frames per second.
+
+    With a screen every frame is also drawn through Renderer, and pushed to
+    the window with present if one is given; without a screen only
+    GameState.step() runs. A new session with the next seed starts
+    whenever one ends.
+    """
+    directions: Iterator[int] = scripted_directions(script)
+    seed: int = 0
+    state: GameState = GameState(seed=seed, image_path=None)
+    renderer: Optional[Renderer] = None
+    label: Optional[HighScoreLabel] = None
+    overlays: List[pygame.sprite.Sprite] = []
+    if screen is not None:
+        renderer = Renderer(screen, LIGHT_BLUE)
+        if present is not None:
+            renderer.present = present
+        label = HighScoreLabel(
+            10, 10, 36, (0, 0, 0), "Score", "High Score"
+        )
+        overlays.append(label)
+
+    start: float = time.perf_counter()
+    for _ in range(frames):
+        if state.game_over:
+            seed += 1
+            state = GameState(seed=seed, image_path=None)
+        state.step(next(directions))
+        if renderer is not None and label is not None:
+            if state.score != label.score:
+                label.update_score(state.score, state.high_score)
+            renderer.render(state.player, state.platforms, state.camera, overlays)
+    return frames / (time.perf_counter() - start)
+
+
+def time_call(function: Callable[[], object], number: int, repeat: int = 5) -> float:
+    # Best of several runs, in microseconds per call
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e6
+
+
+def mid_game_state() -> GameState:
+    state: GameState = GameState(seed=1, image_path=None)
+    directions: Iterator[int] = scripted_directions(SCRIPTS["zigzag"])
+    for _ in range(200):
+        state.step(next(directions))
+    return state
+
+
+def micro_benchmarks(screen: pygame.Surface) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+
+    world: World = World(SCREEN_WIDTH, SCREEN_HEIGHT, seed=0)
+    chunk_index: Iterator[int] = itertools.count()
+    results["generate_chunk"] = time_call(lambda: world.generate_chunk(next(chunk_index)), 2_000)
+
+    state: GameState = mid_game_state()
+    topleft: Tuple[int, int] = state.player.rect.topleft
+    bottom: int = state.player.rect.bottom
+
+    def collision_pass() -> None:
+        # A landing moves the player and makes them jump, so start every pass falling from the same spot
+        state.player.rect.topleft = topleft
+        state.player_y_change = 1  # Falling, so the whole landing test runs
+        state.resolve_collisions(bottom)
+
+    results["collision_pass"] = time_call(collision_pass, 20_000)
+
+    camera: Camera = state.camera
+    renderer: Renderer = Renderer(screen, LIGHT_BLUE)
+
+    def draw_platforms() -> None:
+        renderer.begin_frame()
+        renderer.draw_platforms(state.platforms, camera)
+
+    results["draw_platforms"] = time_call(draw_platforms, 10_000)
+    results["render_frame"] = time_call(
+        lambda: renderer.render(state.player, state.platforms, camera, []), 2_000
+    )
+    results["camera_apply"] = time_call(lambda: camera.apply(state.player.rect), 50_000)
+
+    data: bytearray = snapshot(state)
+    fork: GameState = restore(data, image_path=None)
+    results["snapshot"] = time_call(lambda: snapshot(state), 20_000)
+    results["restore_in_place"] = time_call(lambda: restore(data, fork), 5_000)
+
+    label: HighScoreLabel = HighScoreLabel(10, 10, 36, (0, 0, 0), "Score", "High Score")
+
+    def update_score() -> None:
+        label.update_score(label.score + 1, label.high_score + 1)
+
+    results["high_score_label_update_text"] = time_call(update_score, 2_000)
+
+    note: str = load_localized_strings("en").get("project_note", "")
+    note_font: pygame.font.Font = get_font(18)
+    results["wrap_text"] = time_call(lambda: wrap_text(note, note_font, SCREEN_WIDTH - 40), 2_000)
+    return results
+
+
+def run_benchmarks(frames: int) -> dict:
+    pygame.init()
+    screen: pygame.Surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    metrics: Dict[str, dict] = {}
+    for name, script in SCRIPTS.items():
+        metrics[f"session.{name}.fps"] = {
+            "value": run_session(script, frames, screen),
+            "unit": "frames/s",
+            "higher_is_better": True,
+        }
+        metrics[f"session.{name}.headless"] = {
+            "value": run_session(script, frames, None),
+            "unit": "ticks/s",
+            "higher_is_better": True,
+        }
+    for name, microseconds in micro_benchmarks(screen).items():
+        metrics[f"micro.{name}"] = {
+            "value": microseconds,
+            "unit": "us/call",
+            "higher_is_better": False,
+        }
+
+    # Scaled windows replace the plain one, so they come last
+    for label, size in WINDOW_SIZES.items():
+        for mode in SCALE_MODES:
+            display: Display = Display(size, mode)
+            metrics[f"micro.present_{label}_{mode}"] = {
+                "value": time_call(display.update, 100),
+                "unit": "us/call",
+                "higher_is_better": False,
+            }
+        display = Display(size)
+        metrics[f"session.zigzag.fps_{label}"] = {
+            "value": run_session(SCRIPTS["zigzag"], frames, display.surface, display.update),
+            "unit": "frames/s",
+            "higher_is_better": True,
+        }
+    pygame.quit()
+    clear_caches()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "frames": frames,
+        },
+        "metrics": metrics,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Print both runs side by side and return the names of regressed metrics."""
+    regressions: List[str] = []
+    for name, metric in current["metrics"].items():
+        base: Optional[dict] = baseline["metrics"].get(name)
+        if base is None or not base["value"]:
+            print(f"{name:45} {metric['value']:>14.2f} {metric['unit']:9} (no baseline)")
+            continue
+        change: float = metric["value"] / base["value"] - 1
+        worse: float = -change if metric["higher_is_better"] else change
+        flag: str = "REGRESSION" if worse > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(
+            f"{name:45} {metric['value']:>14.2f} {metric['unit']:9} "
+            f"baseline {base['value']:>12.2f} {change:+8.1%} {flag}"
+        )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Frog Jump benchmarks: scripted seeded sessions and hot-function timings"
+    )
+    parser.add_argument(
+        "-o", "--output", help="Write the results as JSON to this file"
+    )
+    parser.add_argument(
+        "-c", "--compare", metavar="BASELINE", help="Compare against a saved JSON result"
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown that counts as a regression (default: 0.10)",
+    )
+    parser.add_argument(
+        "-f", "--frames", type=int, default=3000, help="Frames per session benchmark (default: 3000)"
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    results: dict = run_benchmarks(args.frames)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline: dict = json.load(file)
+        regressed: List[str] = compare(results, baseline, args.threshold)
+        if regressed:
+            print(f"{len(regressed)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+    else:
+        for name, metric in results["metrics"].items():
+            print(f"{name:45} {metric['value']:>14.2f} {metric['unit']}")
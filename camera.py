@@ -8,11 +8,24 @@ class Camera:
     def __init__(self, target: Character):
         self.target: Character = target
         self.offset_y: float = 0
+        self.previous_offset_y: float = 0
         self.offset_smoothing: float = 0.05
 
     def update(self) -> None:
+        self.previous_offset_y = self.offset_y
         target_offset_y: float = self.target.rect.centery - SCREEN_HEIGHT // 2
         self.offset_y += (target_offset_y - self.offset_y) * self.offset_smoothing
 
     def apply(self, obj: pygame.Rect) -> pygame.Rect:
         return obj.move(0, -self.offset_y)
+
+    def interpolated_offset(self, alpha: float) -> float:
+        # Offset between the previous and the current tick, alpha in [0, 1]
+        if alpha >= 1:
+            return self.offset_y
+        return self.previous_offset_y + (self.offset_y - self.previous_offset_y) * alpha
+
+    def apply_ip(self, obj: pygame.Rect, dest: pygame.Rect, alpha: float = 1.0) -> None:
+        # Same result as apply(), written into an existing rect instead of a new one
+        offset: int = int(-self.interpolated_offset(alpha))
+        dest.update(obj.x, obj.y + offset, obj.width, obj.height)
@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from typing import BinaryIO, List, Optional, Tuple
+
+import pygame
+
+from game_logging import AggregatedLog
+
+CAPTURE_FORMATS: Tuple[str, ...] = ("raw", "png")
+QUEUE_SIZE: int = 8  # Frames the writer may fall behind before new ones are dropped
+
+
+def pixel_format(surface: pygame.Surface) -> str:
+    """FFmpeg name of the surface's pixel layout, e.g. "bgr0" or "rgb24"."""
+    size: int = surface.get_bytesize()
+    if size not in (3, 4):
+        raise ValueError(f"Cannot capture {surface.get_bitsize()}-bit surfaces")
+    channels: List[str] = ["0"] * size
+    for mask, shift, name in zip(surface.get_masks(), surface.get_shifts(), "rgba"):
+        if mask:
+            channels[shift // 8] = name
+    if sys.byteorder == "big":
+        channels.reverse()
+    return "".join(channels) + ("24" if size == 3 else "")
+
+
+class FrameCapture:
+    """Records the frames of the window on a background thread.
+
+    capture() is called on the game thread after a frame is drawn. It makes
+    the one copy that is unavoidable, since the window surface is redrawn
+    next frame: the raw pixel buffer, in the window's own pixel format and
+    without any conversion, into one of a fixed set of preallocated frame
+    buffers. A writer thread either appends the frames to a raw video file,
+    to be encoded later with the FFmpeg command logged on close(), or saves
+    them as PNGs in an image sequence, and hands each buffer back. When the
+    writer falls behind and no buffer is free, the frame is skipped before
+    anything is copied, so capture never stalls the game. Capturing only
+    every `every`-th frame keeps slow formats like PNG from dropping frames
+    at random.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        surface: pygame.Surface,
+        fps: int,
+        capture_format: str = "raw",
+        every: int = 1,
+        queue_size: int = QUEUE_SIZE,
+    ):
+        if capture_format not in CAPTURE_FORMATS:
+            raise ValueError(f"Unknown capture format {capture_format!r}")
+        if every < 1:
+            raise ValueError(f"Capture interval must be at least 1 frame, got {every}")
+        self.path: str = path  # Raw video file, or directory of numbered PNG files
+        self.capture_format: str = capture_format
+        self.every: int = every
+        self.fps: float = fps / every
+        self.size: Tuple[int, int] = surface.get_size()
+        self.pixel_format: str = pixel_format(surface)
+        self.frames: int = 0  # Frames seen by capture(), captured or not
+        self.captured: int = 0
+        self.dropped: int = 0
+        self.seconds: float = 0.0  # Time spent in capture() on the game thread
+        self._dropped_log: AggregatedLog = AggregatedLog("captured frames dropped", level=logging.WARNING)
+
+        # Rows are written without the padding a surface may have at the end of each
+        self._row_bytes: int = self.size[0] * surface.get_bytesize()
+        self._pitch: int = surface.get_pitch()
+        self._file: Optional[BinaryIO] = None
+        self._frame_surface: Optional[pygame.Surface] = None
+        if capture_format == "raw":
+            self._file = open(path, "wb")
+        else:
+            os.makedirs(path, exist_ok=True)
+            self._frame_surface = pygame.Surface(self.size, 0, surface)
+
+        # Frame buffers cycle from _free to _queue on the game thread and back on the writer
+        self._free: "queue.Queue[bytearray]" = queue.Queue()
+        for _ in range(queue_size):
+            self._free.put(bytearray(self._pitch * self.size[1]))
+        self._queue: "queue.Queue[Optional[bytearray]]" = queue.Queue()
+        self._writer: threading.Thread = threading.Thread(
+            target=self._write_loop, name="frame-capture", daemon=True
+        )
+        self._writer.start()
+
+    def capture(self, surface: pygame.Surface) -> None:
+        self.frames += 1
+        if (self.frames - 1) % self.every:
+            return
+        start: float = time.perf_counter()
+        try:
+            buffer: bytearray = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            self._dropped_log.record()
+        else:
+            memoryview(buffer)[:] = memoryview(surface.get_view("0")).cast("B")
+            self._queue.put_nowait(buffer)
+            self.captured += 1
+        self.seconds += time.perf_counter() - start
+
+    def _write_loop(self) -> None:
+        written: int = 0
+        while True:
+            data: Optional[bytearray] = self._queue.get()
+            if data is None:
+                return
+            try:
+                if self._file is not None:
+                    if self._pitch == self._row_bytes:
+                        self._file.write(data)
+                    else:
+                        view: memoryview = memoryview(data)
+                        for row in range(self.size[1]):
+                            offset: int = row * self._pitch
+                            self._file.write(view[offset:offset + self._row_bytes])
+                else:
+                    memoryview(self._frame_surface.get_view("0")).cast("B")[:] = data
+                    pygame.image.save(
+                        self._frame_surface, os.path.join(self.path, f"frame-{written:06d}.png")
+                    )
+            except (OSError, pygame.error) as error:
+                logging.error("Could not write captured frame to %s: %s", self.path, error)
+            self._free.put(data)
+            written += 1
+
+    def close(self) -> None:
+        """Wait for the writer to finish the queued frames and report the capture cost."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._dropped_log.flush()
+        width, height = self.size
+        if self._file is not None:
+            self._file.close()
+            with open(f"{self.path}.json", "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "width": width,
+                        "height": height,
+                        "pixel_format": self.pixel_format,
+                        "fps": self.fps,
+                        "frames": self.captured,
+                    },
+                    file,
+                    indent=4,
+                )
+            logging.info(
+                "Encode with: ffmpeg -f rawvideo -pix_fmt %s -s %dx%d -r %g -i %s %s.mp4",
+                self.pixel_format,
+                width,
+                height,
+                self.fps,
+                self.path,
+                os.path.splitext(self.path)[0],
+            )
+        logging.info(
+            "Captured %d of %d frames to %s (%d dropped), %.0f us per frame on the game thread.",
+            self.captured,
+            self.frames,
+            self.path,
+            self.dropped,
+            self.seconds / max(1, self.captured + self.dropped) * 1e6,
+        )
@@ -1,48 +1,68 @@
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import pygame
 
+import constants
+from assets import Sprite, assets
+from platform_index import PlatformIndex
 from platform_sprite import Platform
 
 
 class Character(pygame.sprite.Sprite):
-    def __init__(self, size: int, pos: List[int], image_path: str):
+    def __init__(self, size: int, pos: List[int], image_path: Optional[str]):
         super().__init__()
-        self.original_image: pygame.Surface = pygame.image.load(image_path)
-        self.original_image = pygame.transform.scale(self.original_image, (size, size))
-        self.image: pygame.Surface = self.original_image
+        if image_path is None:
+            # Headless sessions only need the rect, so skip loading the sprite from disk
+            blank: pygame.Surface = pygame.Surface((size, size))
+            self.sprite: Sprite = Sprite(blank, converted=False)
+        else:
+            # Loaded, scaled and flipped once per process, then shared by every new game
+            self.sprite = assets.sprite(image_path, (size, size))
+        self.image: pygame.Surface = self.sprite.image
         self.rect: pygame.Rect = self.image.get_rect(topleft=pos)
+        self.previous_topleft: Tuple[int, int] = self.rect.topleft  # Position before the last update
         self.facing_right: bool = False
         self.last_platform: Optional[Platform] = (
             None  # Track the last platform jumped from
         )
         self.altitude: float = pos[1]  # Initialize altitude based on initial Y position
 
-    def update(self, x_change: float, y_change: float, platforms: List[Platform]) -> None:
+    def update(self, x_change: float, y_change: float, platforms: PlatformIndex) -> None:
+        self.previous_topleft = self.rect.topleft
         self.rect.move_ip(x_change, y_change)
         self.altitude -= y_change  # Update altitude, decrease when descending, increase when ascending
 
-        logging.debug(f"Absolute Y changed: {self.altitude}")
+        logging.debug("Absolute Y changed: %s", self.altitude)
 
         # Update last platform only when the player is on a platform
         self.last_platform = None
-        for platform in platforms:
+        for platform in platforms.overlapping(self.rect.top, self.rect.bottom):
             if self.rect.colliderect(platform.rect) and y_change >= 0:
                 self.last_platform = platform
                 break
 
+    def interpolated_topleft(self, alpha: float) -> Tuple[int, int]:
+        # Position between the previous and the current tick, alpha in [0, 1]
+        if alpha >= 1:
+            return self.rect.topleft
+        previous_x, previous_y = self.previous_topleft
+        return (
+            round(previous_x + (self.rect.x - previous_x) * alpha),
+            round(previous_y + (self.rect.y - previous_y) * alpha),
+        )
+
     def draw(self, surface: pygame.Surface) -> None:
         surface.blit(self.image, self.rect)
 
     def jump(self) -> int:
         self.rect.y -= 1  # Move the player slightly off the platform
-        return -15  # Set the initial upward velocity
+        return constants.JUMP_VELOCITY  # Set the initial upward velocity
 
     def flip_horizontally(self, direction: str) -> None:
         if direction == "right" and not self.facing_right:
-            self.image = pygame.transform.flip(self.original_image, True, False)
+            self.image = self.sprite.flipped
             self.facing_right = True
         elif direction == "left" and self.facing_right:
-            self.image = self.original_image
+            self.image = self.sprite.image
             self.facing_right = False
@@ -0,0 +1,6 @@
+# Lets plain `pytest` from the repository root import the game's top-level modules
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Tests never open a real window
@@ -15,9 +15,20 @@ DARK_BROWN: Tuple[int, int, int] = (101, 67, 33)  # Dark brown color for the pla
 # Frame rate
 FPS: int = 60
 
+# Physics runs at a fixed rate regardless of the frame rate; GRAVITY, the jump
+# velocity and the horizontal speed are per-tick values at this rate
+TICK_RATE: int = 60
+MAX_TICKS_PER_FRAME: int = 5  # Catch-up limit so a long stall cannot snowball
+SNAPSHOT_INTERVAL: int = TICK_RATE  # Ticks between snapshots of a live session, with --snapshot
+
 # Game variables
 GRAVITY: float = 0.5
 JUMP_HEIGHT: int = 10
+JUMP_VELOCITY: int = -15  # Vertical speed after landing on a platform
+PLAYER_SPEED: int = 5  # Horizontal speed while a direction is held
+
+PLAYER_SIZE: int = 80
+PLAYER_IMAGE: str = "frog.png"
 
 PLATFORM_WIDTH: int = 70
 PLATFORM_HEIGHT: int = 20
@@ -25,3 +36,8 @@ PLATFORM_HEIGHT: int = 20
 # Platform distances
 MIN_PLATFORM_DISTANCE: int = 130
 MAX_PLATFORM_DISTANCE: int = 220
+
+# Level generation
+CHUNK_HEIGHT: int = 1200  # World height generated at once
+PREFETCH_CHUNKS: int = 2  # Chunks generated in the background ahead of the player
+GENERATION_LOOKAHEAD: int = SCREEN_HEIGHT  # Platforms exist this far above the top of the view
@@ -0,0 +1,208 @@
+import logging
+import os
+import statistics
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import pygame
+
+from constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+SCALE_MODES: Tuple[str, ...] = ("nearest", "smooth")
+BORDER_COLOR: Tuple[int, int, int] = (0, 0, 0)  # Bars around the picture when the aspect ratios differ
+
+# Events after which the window has to be presented again
+REDRAW_EVENTS: Tuple[int, ...] = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED)
+RESIZE_EVENTS: Tuple[int, ...] = (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED)
+
+REFRESH_PRESENTS: int = 20  # Back-to-back presents timed to measure the refresh interval with vsync
+MAX_REFRESH_RATE: float = 500.0  # Presents closer together than this did not wait for the display
+
+
+def viewport(
+    window_size: Tuple[int, int], size: Tuple[int, int], integer_scale: bool = False
+) -> pygame.Rect:
+    """Largest rect of the given aspect ratio centred in the window.
+
+    With integer_scale the factor is rounded down to a whole number, unless
+    the window is too small for even one, so every pixel of the picture
+    becomes a block of the same size.
+    """
+    window_width, window_height = window_size
+    width, height = size
+    factor: float = min(window_width / width, window_height / height)
+    if integer_scale and factor >= 1:
+        factor = int(factor)
+    rect: pygame.Rect = pygame.Rect(0, 0, max(1, round(width * factor)), max(1, round(height * factor)))
+    rect.center = (window_width // 2, window_height // 2)
+    return rect
+
+
+class Display:
+    """The window, and the fixed-size surface the game draws into.
+
+    Everything is drawn at SCREEN_WIDTH x SCREEN_HEIGHT into `surface`,
+    whatever the window size, and update() takes the place of
+    pygame.display.update(). When the picture fits the window unscaled, the
+    changed rects are copied across as they are. Otherwise the whole
+    surface is scaled once per presented frame, straight into a subsurface
+    of the window covering the viewport, so there is no intermediate
+    surface and no second copy; frames in which nothing changed are not
+    scaled at all. Nearest-neighbour scaling keeps pixel edges sharp and
+    costs about a third of smooth (bilinear) scaling.
+
+    The window can be resized, and F11 switches to fullscreen at the
+    desktop resolution and back; both go through handle_event().
+
+    With vsync the window is opened through SDL's renderer instead: SDL
+    scales the picture on the GPU and every update() waits for the next
+    vertical blank, so present_end is when the frame was shown. Integer
+    scaling is not available there. Some drivers accept vsync and ignore
+    it, so the window is presented a few times back to back when it opens:
+    refresh_interval is set if those presents waited, and vsync is turned
+    off otherwise.
+    """
+
+    def __init__(
+        self,
+        window_size: Optional[Tuple[int, int]] = None,
+        scale_mode: str = "nearest",
+        integer_scale: bool = False,
+        fullscreen: bool = False,
+        vsync: bool = False,
+    ):
+        if scale_mode not in SCALE_MODES:
+            raise ValueError(f"Unknown scale mode {scale_mode!r}")
+        self.size: Tuple[int, int] = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.window_size: Tuple[int, int] = window_size or self.size  # Size of the window when not fullscreen
+        self.scale_mode: str = scale_mode
+        self.integer_scale: bool = integer_scale
+        self.fullscreen: bool = fullscreen
+        self.vsync: bool = vsync
+        self.refresh_interval: Optional[float] = None  # Seconds between vertical blanks, with vsync
+        # perf_counter() before and after the last update() that pushed anything to the window
+        self.present_start: float = 0.0
+        self.present_end: float = 0.0
+        self.window: pygame.Surface = self._open_window()
+        # Same pixel format as the window, so presenting never converts pixels
+        self.surface: pygame.Surface = pygame.Surface(self.size, 0, self.window)
+        self.viewport: pygame.Rect = pygame.Rect(0, 0, *self.size)
+        self._target: Optional[pygame.Surface] = None  # Window subsurface that scaled frames are written to
+        self._window_rects: List[pygame.Rect] = []
+        self._laid_out_size: Tuple[int, int] = (0, 0)
+        self._layout()
+        self._measure_refresh()
+
+    def _measure_refresh(self) -> None:
+        if not self.vsync:
+            self.refresh_interval = None  # Also when reopening the window just turned vsync off
+            return
+        intervals: List[float] = []
+        previous: float = time.perf_counter()
+        for _ in range(REFRESH_PRESENTS):
+            pygame.display.flip()
+            now: float = time.perf_counter()
+            intervals.append(now - previous)
+            previous = now
+        interval: float = statistics.median(intervals)
+        if interval * MAX_REFRESH_RATE >= 1:
+            self.refresh_interval = interval
+            logging.info("Display refresh measured at %.2f Hz.", 1 / interval)
+        else:
+            logging.warning(
+                "Vsync was accepted but presents do not wait for the display (%.2f ms apart); presenting without it.",
+                interval * 1000,
+            )
+            self.vsync = False
+            self.refresh_interval = None
+
+    def _open_window(self) -> pygame.Surface:
+        if self.vsync:
+            # SDL reads its scaling filter when the renderer is created
+            os.environ["SDL_RENDER_SCALE_QUALITY"] = "linear" if self.scale_mode == "smooth" else "nearest"
+            flags: int = pygame.SCALED | (pygame.FULLSCREEN if self.fullscreen else pygame.RESIZABLE)
+            try:
+                return pygame.display.set_mode(self.size, flags, vsync=1)
+            except pygame.error as error:
+                logging.warning("Vsync is not available, presenting without it: %s", error)
+                self.vsync = False
+        if self.fullscreen:
+            return pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        return pygame.display.set_mode(self.window_size, pygame.RESIZABLE)
+
+    @property
+    def scaled(self) -> bool:
+        return self.viewport.size != self.size
+
+    def _layout(self) -> None:
+        # Place the picture in the current window and redraw the whole window around it
+        self.window = pygame.display.get_surface()
+        self._laid_out_size = self.window.get_size()
+        self.viewport = viewport(self.window.get_size(), self.size, self.integer_scale)
+        self._target = self.window.subsurface(self.viewport) if self.scaled else None
+        self.window.fill(BORDER_COLOR)
+        self._present(None)
+        pygame.display.flip()
+
+    def _present(self, rects: Optional[Sequence[pygame.Rect]]) -> None:
+        # Copy the picture, or only the given rects of it, into the window
+        if self._target is not None:
+            if self.scale_mode == "smooth":
+                pygame.transform.smoothscale(self.surface, self.viewport.size, self._target)
+            else:
+                pygame.transform.scale(self.surface, self.viewport.size, self._target)
+        elif rects is None:
+            self.window.blit(self.surface, self.viewport)
+        else:
+            window_rects: List[pygame.Rect] = self._window_rects
+            window_rects.clear()
+            left, top = self.viewport.topleft
+            for rect in rects:
+                window_rects.append(self.window.blit(self.surface, (rect.x + left, rect.y + top), rect))
+
+    def update(self, rects: Optional[Sequence[pygame.Rect]] = None) -> None:
+        """Show the surface, or the given changed rects of it, in the window."""
+        if rects is not None and not rects:
+            return
+        self.present_start = time.perf_counter()
+        if self.scaled:
+            rects = None  # A scaled rect would bleed into its neighbours, so the whole picture is scaled
+        self._present(rects)
+        pygame.display.update(self.viewport if rects is None else self._window_rects)
+        self.present_end = time.perf_counter()
+
+    def toggle_fullscreen(self) -> None:
+        self.fullscreen = not self.fullscreen
+        self._open_window()
+        self._layout()
+        self._measure_refresh()  # Fullscreen may run the display at a different rate
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """Follow window resizes, exposes and the fullscreen key; returns True if the event was handled."""
+        if event.type in RESIZE_EVENTS:
+            # A resize arrives as both event types; the layout is only redone once
+            size: Tuple[int, int] = pygame.display.get_surface().get_size()
+            if size != self._laid_out_size:
+                if not self.fullscreen:
+                    self.window_size = size
+                self._layout()
+            return True
+        if event.type in REDRAW_EVENTS:
+            self._present(None)
+            pygame.display.flip()
+            return True
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+            self.toggle_fullscreen()
+            return True
+        return False
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    """Parse a window size given as "WIDTHxHEIGHT", e.g. "1920x1080"."""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Expected a size like 1920x1080, got {text!r}") from None
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Window size must be positive, got {text!r}")
+    return width, height
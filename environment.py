@@ -0,0 +1,207 @@
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from batch_sim import BatchSimulator
+from constants import PLATFORM_WIDTH, PLAYER_SIZE, PLAYER_SPEED, TICK_RATE
+from game_state import GameState
+
+# Discrete actions and the horizontal input each one stands for
+ACTIONS: Tuple[int, ...] = (-1, 0, 1)  # left, none, right
+
+NEAREST_PLATFORMS: int = 5  # Platforms described in each observation
+MAX_EPISODE_TICKS: int = 10 * 60 * TICK_RATE  # Episodes are truncated after ten minutes of play
+
+# Observation layout, all float32 and in pixels or pixels per tick:
+#   0  player centre x
+#   1  player bottom relative to the top of the view
+#   2  horizontal velocity
+#   3  vertical velocity (positive is falling)
+#   4  score
+#   then for each of the NEAREST_PLATFORMS platforms around the player, lowest
+#   first: dx and dy from the player's bottom centre to the platform's top
+#   centre (negative dy is above), and 1.0 if the slot holds a platform
+PLAYER_FEATURES: int = 5
+PLATFORM_FEATURES: int = 3
+
+
+def observation_size(nearest: int = NEAREST_PLATFORMS) -> int:
+    return PLAYER_FEATURES + PLATFORM_FEATURES * nearest
+
+
+class FrogJumpEnv:
+    """Reinforcement-learning interface to a single headless session.
+
+    Follows the Gym conventions: reset(seed) returns (observation, info) and
+    step(action) returns (observation, reward, terminated, truncated, info).
+    Actions index ACTIONS. The reward is the number of platforms passed in
+    the step, so the return of an episode is its final score. Episodes end
+    at game over (terminated) or after max_ticks (truncated).
+
+    Nothing is drawn and there is no frame cap; a step costs one
+    GameState.step() plus filling the observation.
+    """
+
+    def __init__(self, nearest: int = NEAREST_PLATFORMS, max_ticks: int = MAX_EPISODE_TICKS):
+        self.nearest: int = nearest
+        self.max_ticks: int = max_ticks
+        self.observation_size: int = observation_size(nearest)
+        self.action_count: int = len(ACTIONS)
+        self.state: Optional[GameState] = None
+        self._direction: int = 0
+        self._empty: List[float] = [0.0] * (PLATFORM_FEATURES * nearest)
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        if seed is None:
+            seed = random.randrange(2**63)
+        self.state = GameState(seed=seed, image_path=None)
+        self._direction = 0
+        return self._observe(), {"seed": seed}
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
+        state: GameState = self.state
+        score: int = state.score
+        self._direction = ACTIONS[action]
+        state.step(self._direction)
+        terminated: bool = state.game_over
+        truncated: bool = not terminated and state.ticks >= self.max_ticks
+        return self._observe(), float(state.score - score), terminated, truncated, {}
+
+    def _observe(self) -> np.ndarray:
+        state: GameState = self.state
+        rect = state.player.rect
+        centre: int = rect.centerx
+        bottom: int = rect.bottom
+        values: List[float] = [
+            centre,
+            bottom - state.camera.offset_y,
+            self._direction * PLAYER_SPEED,
+            state.player_y_change,
+            state.score,
+        ]
+        values.extend(self._empty)
+        i: int = PLAYER_FEATURES
+        for platform in state.platforms.around(bottom, self.nearest):
+            values[i] = platform.rect.x + PLATFORM_WIDTH // 2 - centre
+            values[i + 1] = platform.rect.top - bottom
+            values[i + 2] = 1.0
+            i += PLATFORM_FEATURES
+        return np.array(values, dtype=np.float32)
+
+
+class VectorFrogJumpEnv:
+    """Many sessions stepped together in one call, backed by BatchSimulator.
+
+    Observations, rewards and flags are arrays with one row per session and
+    the same meaning as in FrogJumpEnv. Sessions that end are restarted with
+    a new seed inside step(), as Gym vector environments do; the observation
+    and score they ended with are returned in the info dict under
+    "final_observation" and "final_score", next to a "done" mask.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        nearest: int = NEAREST_PLATFORMS,
+        max_ticks: int = MAX_EPISODE_TICKS,
+    ):
+        self.num_envs: int = num_envs
+        self.nearest: int = nearest
+        self.max_ticks: int = max_ticks
+        self.observation_size: int = observation_size(nearest)
+        self.action_count: int = len(ACTIONS)
+        self.sim: Optional[BatchSimulator] = None
+        self._rng: np.random.Generator = np.random.default_rng()
+        self._directions: np.ndarray = np.zeros(num_envs, dtype=np.int64)
+        self._actions: np.ndarray = np.array(ACTIONS, dtype=np.int64)
+
+    def _seeds(self, count: int) -> List[int]:
+        return self._rng.integers(0, 2**63 - 1, count, dtype=np.int64).tolist()
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Start every session; with a seed, session i uses seed + i and restarts are reproducible."""
+        self._rng = np.random.default_rng(seed)
+        seeds: List[int] = (
+            [seed + i for i in range(self.num_envs)] if seed is not None else self._seeds(self.num_envs)
+        )
+        self.sim = BatchSimulator(seeds)
+        self._directions[:] = 0
+        return self._observe(), {"seed": np.array(seeds, dtype=np.int64)}
+
+    def step(
+        self, actions: Sequence[int]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        sim: BatchSimulator = self.sim
+        score: np.ndarray = sim.score.copy()
+        self._directions = self._actions[np.asarray(actions, dtype=np.int64)]
+        sim.step(self._directions)
+        rewards: np.ndarray = (sim.score - score).astype(np.float32)
+        terminated: np.ndarray = sim.game_over
+        truncated: np.ndarray = ~terminated & (sim.ticks >= self.max_ticks)
+        observations: np.ndarray = self._observe()
+
+        info: Dict[str, Any] = {}
+        done: np.ndarray = terminated | truncated
+        if done.any():
+            rows: np.ndarray = np.flatnonzero(done)
+            info = {
+                "done": done,
+                "final_observation": observations[rows],
+                "final_score": sim.score[rows].copy(),
+            }
+            sim.restart(rows, self._seeds(rows.size))
+            self._directions[rows] = 0
+            observations[rows] = self._observe()[rows]
+        return observations, rewards, terminated, truncated, info
+
+    def _observe(self) -> np.ndarray:
+        sim: BatchSimulator = self.sim
+        nearest: int = self.nearest
+        centre: np.ndarray = sim.x + PLAYER_SIZE // 2
+        bottom: np.ndarray = sim.y + PLAYER_SIZE
+        observations: np.ndarray = np.empty(
+            (sim.size, self.observation_size), dtype=np.float32
+        )
+        observations[:, 0] = centre
+        observations[:, 1] = bottom - sim.offset_y
+        observations[:, 2] = self._directions * PLAYER_SPEED
+        observations[:, 3] = sim.y_change
+        observations[:, 4] = sim.score
+
+        left, top, live = sim.platforms_around(nearest)
+        platforms: np.ndarray = observations[:, PLAYER_FEATURES:].reshape(
+            sim.size, nearest, PLATFORM_FEATURES
+        )
+        platforms[:, :, 0] = np.where(live, left + PLATFORM_WIDTH // 2 - centre[:, None], 0)
+        platforms[:, :, 1] = np.where(live, top - bottom[:, None], 0)
+        platforms[:, :, 2] = live
+        return observations
+
+
+def benchmark(num_envs: int, steps: int = 2000) -> float:
+    """Return environment steps per second with random actions."""
+    rng: np.random.Generator = np.random.default_rng(0)
+    if num_envs == 1:
+        env: FrogJumpEnv = FrogJumpEnv()
+        env.reset(0)
+        actions: List[int] = rng.integers(0, len(ACTIONS), steps).tolist()
+        start: float = time.perf_counter()
+        for action in actions:
+            _, _, terminated, truncated, _ = env.step(action)
+            if terminated or truncated:
+                env.reset()
+        return steps / (time.perf_counter() - start)
+
+    vector_env: VectorFrogJumpEnv = VectorFrogJumpEnv(num_envs)
+    vector_env.reset(0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        vector_env.step(rng.integers(0, len(ACTIONS), num_envs))
+    return steps * num_envs / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    for n, steps in ((1, 50_000), (100, 2000), (10_000, 200)):
+        print(f"envs={n}: {benchmark(n, steps):,.0f} steps/sec")
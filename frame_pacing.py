@@ -0,0 +1,135 @@
+import logging
+import time
+from array import array
+from collections import deque
+from typing import Deque, List, Optional
+
+from profiler import FrameProfiler, percentile
+
+PACING_MARGIN: float = 0.001  # Seconds of slack kept between finishing a frame and its deadline
+PACING_WINDOW: int = 120  # Frames of work time the wake-up budget is based on
+LATENCY_LOG_INTERVAL: float = 10.0  # Seconds between latency summaries in the log
+
+
+class FramePacer:
+    """Sleeps at the start of a frame instead of at the end, so input is read as late as possible.
+
+    Normally main.game() polls input, simulates, draws and presents, and
+    only then sleeps off the rest of the frame; with vsync the finished
+    frame also waits inside update() for the next vertical blank. Either
+    way the input it shows was read most of a frame before it is seen. In
+    low-latency mode wait() comes first instead: it sleeps until one
+    frame's worth of work before the next deadline, then the loop polls
+    input and runs the frame. The work budget is the 95th percentile of the
+    time from the planned wake-up to the start of the present over the last
+    PACING_WINDOW frames, so oversleeping counts as work, plus
+    PACING_MARGIN.
+
+    Without vsync, deadlines are spaced 1 / fps apart. With vsync, given
+    the display's refresh interval, they follow the display instead: every
+    present that waits for a vertical blank ends on one, and the next is
+    one refresh interval later. end_frame() takes the current interval, so
+    pacing follows the display when it changes rate.
+    """
+
+    def __init__(
+        self, fps: int, refresh_interval: Optional[float] = None, margin: float = PACING_MARGIN
+    ):
+        self.fps: int = fps
+        self.margin: float = margin
+        self._work: Deque[float] = deque(maxlen=PACING_WINDOW)
+        self._woke: float = 0.0  # When the current frame was meant to start
+        self._retime(refresh_interval, time.perf_counter())
+
+    def _retime(self, refresh_interval: Optional[float], now: float) -> None:
+        # Start pacing afresh, e.g. after fullscreen switched the display to another rate
+        self.refresh_interval: Optional[float] = refresh_interval
+        self.vsync: bool = refresh_interval is not None
+        self.period: float = refresh_interval or 1 / self.fps  # Time between deadlines
+        self.budget: float = self.period  # Until work has been measured, wake up a whole frame early
+        self._work.clear()
+        self._deadline: float = now + self.period
+
+    def wait(self) -> None:
+        now: float = time.perf_counter()
+        wake: float = self._deadline - self.budget
+        if wake > now:
+            time.sleep(wake - now)
+        self._woke = max(wake, now)
+
+    def end_frame(
+        self, present_start: float, present_end: float, refresh_interval: Optional[float] = None
+    ) -> None:
+        """Account for the frame that just ran, given the Display's present timestamps and refresh interval.
+
+        The refresh interval is read every frame since the display can
+        change it, e.g. when switching to or from fullscreen; a change
+        starts pacing over at the new rate.
+        """
+        now: float = time.perf_counter()
+        if refresh_interval != self.refresh_interval:
+            self._retime(refresh_interval, now)
+            return
+        presented: bool = present_start >= self._woke
+        if presented:
+            self._work.append(present_start - self._woke)
+            work: List[float] = sorted(self._work)
+            self.budget = min(percentile(work, 0.95) + self.margin, self.period)
+
+        if self.vsync and presented:
+            self._deadline = present_end + self.period
+        else:
+            self._deadline += self.period
+        if self._deadline < now:
+            # A frame ran long; pace from here instead of rushing to catch up
+            self._deadline = now + self.period
+
+
+class LatencyMeter:
+    """Measures how long input waits before a frame that reflects it is presented.
+
+    Pygame events carry no timestamp, so an event is assumed to arrive at a
+    random moment between two polls. Its expected latency is then half the
+    time since the previous poll plus the time from this poll until the
+    present finished, which with vsync is the vertical blank the frame is
+    shown on. The value is set on the profiler every frame that presents,
+    and a p50/p95/p99 summary is logged every LATENCY_LOG_INTERVAL seconds.
+    """
+
+    def __init__(self, profiler: Optional[FrameProfiler] = None):
+        self.profiler: Optional[FrameProfiler] = profiler
+        self._samples: array = array("d")
+        self._previous_poll: float = 0.0
+        self._poll: float = 0.0
+        self._window_start: float = time.perf_counter()
+
+    def polled(self) -> None:
+        # Call right before input is read
+        self._previous_poll = self._poll
+        self._poll = time.perf_counter()
+
+    def presented(self, present_end: float) -> None:
+        # Call after the frame, with the Display's present_end
+        if present_end < self._poll or not self._previous_poll:
+            return  # Nothing was presented this frame
+        latency: float = (self._poll - self._previous_poll) / 2 + present_end - self._poll
+        self._samples.append(latency)
+        if self.profiler is not None:
+            self.profiler.measure("latency", latency)
+        if present_end - self._window_start >= LATENCY_LOG_INTERVAL:
+            self.flush(present_end)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.perf_counter()
+        if self._samples:
+            values: List[float] = sorted(self._samples)
+            logging.info(
+                "Input-to-present latency over %d frames: p50 %.1f ms, p95 %.1f ms, p99 %.1f ms",
+                len(values),
+                percentile(values, 0.50) * 1000,
+                percentile(values, 0.95) * 1000,
+                percentile(values, 0.99) * 1000,
+            )
+            self._samples = array("d")
+        self._window_start = now
@@ -0,0 +1,94 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
+import weakref
+from typing import Optional
+
+LOG_FORMAT: str = "%(asctime)s - %(module)s - %(levelname)s - %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_aggregated_logs: "weakref.WeakSet[AggregatedLog]" = weakref.WeakSet()  # Flushed by stop_logging()
+
+
+def setup_logging(level: int, log_file: str = "game.log") -> None:
+    """Route all records through a queue to handlers running on a background thread.
+
+    The frame loop only pays for putting a record on the queue; formatting and
+    the file and console writes happen on the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    formatter: logging.Formatter = logging.Formatter(LOG_FORMAT)
+    file_handler: logging.Handler = logging.FileHandler(log_file)
+    stream_handler: logging.Handler = logging.StreamHandler()
+    file_handler.setFormatter(formatter)
+    stream_handler.setFormatter(formatter)
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+    root: logging.Logger = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Log what every AggregatedLog has counted so far, flush the queue and stop the background writer."""
+    global _listener
+    for log in list(_aggregated_logs):
+        log.flush()
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+class AggregatedLog:
+    """Collapses a high-frequency event into one record per interval.
+
+    record() only bumps a counter until the interval has elapsed, then logs
+    a single summary such as "12 platforms generated in last 1.0 s". What
+    is left over when the program exits is logged by stop_logging().
+    """
+
+    def __init__(self, what: str, interval: float = 1.0, level: int = logging.INFO):
+        self.what: str = what
+        self.interval: float = interval
+        self.level: int = level
+        self.count: int = 0
+        self._window_start: float = time.monotonic()
+        _aggregated_logs.add(self)
+
+    def record(self, count: int = 1) -> None:
+        self.count += count
+        now: float = time.monotonic()
+        if now - self._window_start >= self.interval:
+            self._emit(now)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        self._emit(time.monotonic() if now is None else now)
+
+    def _emit(self, now: float) -> None:
+        # Only called from record() and flush(), so the frame above those is their caller
+        if self.count and logging.getLogger().isEnabledFor(self.level):
+            logging.log(
+                self.level,
+                "%d %s in last %.1f s",
+                self.count,
+                self.what,
+                now - self._window_start,
+                stacklevel=3,  # Attribute the summary to the module calling record() or flush()
+            )
+        self.count = 0
+        self._window_start = now
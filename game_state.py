@@ -0,0 +1,172 @@
+import logging
+import random
+from typing import Callable, Optional
+
+import constants
+from camera import Camera
+from character import Character
+from constants import (
+    GENERATION_LOOKAHEAD,
+    PLAYER_IMAGE,
+    PLAYER_SIZE,
+    PLAYER_SPEED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
+from platform_index import PlatformIndex
+from platform_sprite import Platform
+from profiler import FrameProfiler
+from world import World
+
+class GameState:
+    """Display-independent state of a single game session.
+
+    Holds the player, camera, platforms and score and advances them one tick
+    at a time via step(). Nothing here touches the window or the frame clock,
+    so sessions can be simulated headless as fast as the CPU allows.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        high_score: int = 0,
+        image_path: Optional[str] = PLAYER_IMAGE,
+        prefetch: bool = False,
+    ):
+        if seed is None:
+            seed = random.randrange(2**63)
+        self.world: World = World(SCREEN_WIDTH, SCREEN_HEIGHT, seed, prefetch=prefetch)
+        self.score: int = 0
+        self.high_score: int = high_score
+        self.passed_platforms: int = 0
+        self.ticks: int = 0
+        self.profiler: Optional[FrameProfiler] = None  # Set to time the phases of step()
+        self.last_platform_jumped: Optional[Platform] = None
+
+        self.player: Character = Character(
+            PLAYER_SIZE, [SCREEN_WIDTH // 2, SCREEN_HEIGHT - PLAYER_SIZE], image_path
+        )
+        self.player_y_change: float = 0
+        self.camera: Camera = Camera(self.player)
+
+        # Generate the initial platforms, from the starting one up to the lookahead
+        self.platforms: PlatformIndex = PlatformIndex()
+        self.world.populate(self.platforms, self.camera.offset_y - GENERATION_LOOKAHEAD)
+
+        # Set player's starting position on the second platform
+        self.player.rect.bottomleft = (SCREEN_WIDTH // 2, self.platforms[1].rect.top)
+        self.player.previous_topleft = self.player.rect.topleft
+
+    @property
+    def game_over(self) -> bool:
+        return self.player.rect.top > self.camera.offset_y + SCREEN_HEIGHT
+
+    def resolve_collisions(self, previous_bottom: int) -> None:
+        """Land the player on a platform crossed since the previous tick.
+
+        The test is swept from the previous bottom edge, so a fast fall cannot
+        tunnel through a platform. Within a tick the highest candidate is
+        touched first.
+        """
+        player: Character = self.player
+        if self.player_y_change > 0:  # Check if the player is falling
+            sweep_top: int = min(player.rect.top, previous_bottom)
+            for platform in self.platforms.overlapping(
+                sweep_top, player.rect.bottom, highest_first=True
+            ):
+                if (
+                    player.rect.left < platform.rect.right
+                    and player.rect.right > platform.rect.left
+                ):
+                    player.rect.bottom = (
+                        platform.rect.top
+                    )  # Adjust the player's position to be on top of the platform
+                    self.player_y_change = player.jump()  # Make the character jump automatically when they fall onto a platform
+
+                    # Update last_platform_jumped only when jumping on a new higher platform
+                    if (
+                        self.last_platform_jumped is None
+                        or platform.rect.top < self.last_platform_jumped.rect.top
+                    ):
+                        self.last_platform_jumped = platform
+                    break
+
+    def step(self, direction: int) -> None:
+        """Advance the session by one tick with the given horizontal input."""
+        player: Character = self.player
+        profiler: Optional[FrameProfiler] = self.profiler
+        self.ticks += 1
+
+        # Update passed_platforms and high score only when the player jumps on a new higher platform
+        last_platform_jumped: Optional[Platform] = self.last_platform_jumped
+        if (
+            last_platform_jumped is not None
+            and player.rect.bottom <= last_platform_jumped.rect.top
+        ):
+            lowest_platform: Platform = self.platforms.lowest()
+            if (
+                last_platform_jumped.rect.top < lowest_platform.rect.top
+                and not last_platform_jumped.passed
+            ):
+                self.passed_platforms += 1
+                last_platform_jumped.passed = True
+                logging.info(
+                    "You have passed platform with ID %d", last_platform_jumped.id
+                )  # Log the passed platform ID
+                self.score = self.passed_platforms
+                if self.score > self.high_score:
+                    self.high_score = self.score
+
+        # Gravity
+        previous_bottom: int = player.rect.bottom
+        self.player_y_change += constants.GRAVITY  # Read per tick so parameter sweeps can change it
+        player.update(direction * PLAYER_SPEED, self.player_y_change, self.platforms)
+
+        # Keep the player within the screen boundaries
+        if player.rect.left < 0:
+            player.rect.left = 0
+        elif player.rect.right > SCREEN_WIDTH:
+            player.rect.right = SCREEN_WIDTH
+
+        if profiler is not None:
+            profiler.mark("physics")
+
+        # Collision detection
+        self.resolve_collisions(previous_bottom)
+
+        if profiler is not None:
+            profiler.mark("collision")
+
+        # Keep platforms generated up to a fixed distance above the camera
+        self.world.populate(self.platforms, self.camera.offset_y - GENERATION_LOOKAHEAD)
+
+        # Remove platforms that are no longer visible on the screen and hand them back
+        # to the world for reuse, except ones still referenced: the last one jumped on,
+        # which scoring looks at, and the one the player last stood on
+        platforms: PlatformIndex = self.platforms
+        limit: float = self.camera.offset_y + SCREEN_HEIGHT
+        while platforms and platforms.lowest().rect.top >= limit:
+            platform: Platform = platforms.pop_lowest()
+            if platform is not self.last_platform_jumped and platform is not self.player.last_platform:
+                self.world.release(platform)
+
+        if profiler is not None:
+            profiler.mark("platforms")
+
+        # Update camera
+        self.camera.update()
+
+        if profiler is not None:
+            profiler.mark("camera")
+
+
+def run_headless(
+    policy: Callable[[GameState], int],
+    seed: Optional[int] = None,
+    max_ticks: int = 100_000,
+) -> GameState:
+    """Play a full session without a display or frame cap and return its final state."""
+    state: GameState = GameState(seed=seed, image_path=None)
+    while not state.game_over and state.ticks < max_ticks:
+        state.step(policy(state))
+    return state
@@ -1,9 +1,10 @@
 import logging
-from typing import Tuple
+from typing import List, Tuple
 
 import pygame
 
 from constants import LIGHT_BLUE
+from text_cache import render_text
 
 
 class HighScoreLabel(pygame.sprite.Sprite):
@@ -11,13 +12,13 @@ class HighScoreLabel(pygame.sprite.Sprite):
         self,
         x: int,
         y: int,
-        font: pygame.font.Font,
+        font_size: int,
         color: Tuple[int, int, int],
         score_text: str,
         high_score_text: str,
     ):
         super().__init__()
-        self.font: pygame.font.Font = font
+        self.font_size: int = font_size
         self.color: Tuple[int, int, int] = color
         self.score: int = 0
         self.high_score: int = 0
@@ -25,28 +26,70 @@ class HighScoreLabel(pygame.sprite.Sprite):
         self.high_score_text: str = high_score_text
         self.x: int = x
         self.y: int = y
+        self.dirty: int = 1  # Set when the image was changed in place, as with DirtySprite
+        self._parts: List[List[pygame.Surface]] = []
         self.update_text()
 
+    def _line_parts(self, label: str, value: int) -> List[pygame.Surface]:
+        # The label and every digit come from the text cache, so a score change rasterizes nothing new
+        parts: List[pygame.Surface] = [render_text(f"{label}: ", self.font_size, self.color)]
+        parts.extend(render_text(digit, self.font_size, self.color) for digit in str(value))
+        return parts
+
     def update_text(self) -> None:
-        score_text: pygame.Surface = self.font.render(
-            f"{self.score_text}: {self.score}", True, self.color
-        )
-        high_score_text: pygame.Surface = self.font.render(
-            f"{self.high_score_text}: {self.high_score}", True, self.color
-        )
+        lines: List[List[pygame.Surface]] = [
+            self._line_parts(self.score_text, self.score),
+            self._line_parts(self.high_score_text, self.high_score),
+        ]
+        if self._same_layout(lines):
+            self._patch(lines)
+        else:
+            self._compose(lines)
+        self._parts = lines
+        self.dirty = 1
+
+    def _same_layout(self, lines: List[List[pygame.Surface]]) -> bool:
+        if len(lines) != len(self._parts):
+            return False
+        for line, previous_line in zip(lines, self._parts):
+            if len(line) != len(previous_line):
+                return False
+            for part, previous_part in zip(line, previous_line):
+                if part.get_width() != previous_part.get_width():
+                    return False
+        return True
+
+    def _patch(self, lines: List[List[pygame.Surface]]) -> None:
+        # Redraw only the digits that differ from the current image
+        y: int = 0
+        for line, previous_line in zip(lines, self._parts):
+            x: int = 0
+            for part, previous_part in zip(line, previous_line):
+                if part is not previous_part:
+                    self.image.fill(LIGHT_BLUE, (x, y, part.get_width(), part.get_height()))
+                    self.image.blit(part, (x, y))
+                x += part.get_width()
+            y += line[0].get_height()
+
+    def _compose(self, lines: List[List[pygame.Surface]]) -> None:
         self.image: pygame.Surface = pygame.Surface(
             (
-                max(score_text.get_width(), high_score_text.get_width()),
-                score_text.get_height() + high_score_text.get_height(),
+                max(sum(part.get_width() for part in line) for line in lines),
+                sum(line[0].get_height() for line in lines),
             )
         )
         self.image.fill(LIGHT_BLUE)
-        self.image.blit(score_text, (0, 0))
-        self.image.blit(high_score_text, (0, score_text.get_height()))
+        y: int = 0
+        for line in lines:
+            x: int = 0
+            for part in line:
+                self.image.blit(part, (x, y))
+                x += part.get_width()
+            y += line[0].get_height()
         self.rect: pygame.Rect = self.image.get_rect(topleft=(self.x, self.y))
 
     def update_score(self, score: int, high_score: int) -> None:
         self.score = score
         self.high_score = high_score
         self.update_text()
-        logging.info(f"Current score: {score}, High score: {high_score}.")
+        logging.info("Current score: %d, High score: %d.", score, high_score)
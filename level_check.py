@@ -0,0 +1,119 @@
+import argparse
+import multiprocessing
+import os
+import time
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import constants
+from constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from reachability import ReachabilityTable, reachability_table
+from tournament import PARAMETERS, level_error
+from world import World
+
+
+def unreachable_steps(
+    x: np.ndarray, y: np.ndarray, owners: np.ndarray, table: ReachabilityTable
+) -> np.ndarray:
+    """Check consecutive platforms of many levels at once.
+
+    x, y and owners are flat arrays holding every level's platforms lowest
+    first, one level after another, with owners naming the level of each
+    platform. Returns a mask over the steps from platform i to i + 1 that is
+    True where both belong to the same level and the jump cannot make it.
+    """
+    same: np.ndarray = owners[1:] == owners[:-1]
+    return same & ~table.reachable_all(y[:-1] - y[1:], x[1:] - x[:-1])
+
+
+def check_batch(task: Tuple[int, int, int, Dict[str, float]]) -> Tuple[int, List[int]]:
+    """Generate the first chunks of a batch of seeds and return the seeds with an unreachable step."""
+    first_seed, count, chunks, parameters = task
+    for name, value in parameters.items():
+        setattr(constants, name, value)
+    x: array = array("q")
+    y: array = array("q")
+    owners: array = array("q")
+    for seed in range(first_seed, first_seed + count):
+        world: World = World(SCREEN_WIDTH, SCREEN_HEIGHT, seed)
+        for index in range(chunks):
+            for p_x, p_y in world.generate_chunk(index):
+                x.append(p_x)
+                y.append(p_y)
+                owners.append(seed)
+    owner_array: np.ndarray = np.frombuffer(owners, dtype=np.int64)
+    bad: np.ndarray = unreachable_steps(
+        np.frombuffer(x, dtype=np.int64),
+        np.frombuffer(y, dtype=np.int64),
+        owner_array,
+        reachability_table(),
+    )
+    return count, np.unique(owner_array[1:][bad]).tolist()
+
+
+def tasks(args: argparse.Namespace, parameters: Dict[str, float]) -> Iterator[Tuple[int, int, int, Dict[str, float]]]:
+    for first in range(0, args.seeds, args.batch_size):
+        yield args.seed + first, min(args.batch_size, args.seeds - first), args.chunks, parameters
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Generate many seeded levels and report platforms the jump cannot reach"
+    )
+    parser.add_argument(
+        "-n", "--seeds", type=int, default=100_000, help="Seeds to check (default: 100000)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="First seed (default: 0)")
+    parser.add_argument(
+        "-c", "--chunks", type=int, default=2, help="Chunks generated per seed (default: 2)"
+    )
+    for name, option in PARAMETERS.items():
+        parser.add_argument(
+            f"--{option.replace('_', '-')}",
+            type=type(getattr(constants, name)),
+            help=f"Override {name} (default: {getattr(constants, name)})",
+        )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Worker processes (default: one per CPU core)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=2000, help="Seeds per task sent to a worker (default: 2000)"
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    parameters: Dict[str, float] = {
+        name: getattr(args, option)
+        for name, option in PARAMETERS.items()
+        if getattr(args, option) is not None
+    }
+    error: Optional[str] = level_error(parameters)
+    if error is not None:
+        parser.error(error)
+    for name, value in parameters.items():
+        setattr(constants, name, value)
+    table: ReachabilityTable = reachability_table()
+    print(
+        f"Highest reachable gap {table.max_gap} px; "
+        f"gaps up to {max(gap for gap in range(table.max_gap + 1) if table.reachable(gap, table.max_offset))} px "
+        f"are reachable from any horizontal offset"
+    )
+
+    start: float = time.perf_counter()
+    checked: int = 0
+    failing: List[int] = []
+    with multiprocessing.Pool(args.workers) as pool:
+        for count, seeds in pool.imap_unordered(check_batch, tasks(args, parameters)):
+            checked += count
+            failing.extend(seeds)
+    elapsed: float = time.perf_counter() - start
+    print(f"Checked {checked} seeds x {args.chunks} chunks in {elapsed:.1f} s ({checked / elapsed:.0f} seeds/s)")
+    if failing:
+        print(f"{len(failing)} seeds have an unreachable platform, e.g. {sorted(failing)[:10]}")
+    else:
+        print("Every platform is reachable from the one below it")
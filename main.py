@@ -1,47 +1,56 @@
 import argparse
 import json
 import logging
+import os
 import random
+import struct
 import sys
+import time
 from typing import List, Optional
 
+from startup import mark_startup  # Starts the launch clock, so it comes before pygame
+
 import pygame
 
+from assets import assets
 from camera import Camera
+from capture import CAPTURE_FORMATS, FrameCapture
 from character import Character
 from constants import (
     FPS,
-    GRAVITY,
     LIGHT_BLUE,
-    MAX_PLATFORM_DISTANCE,
-    MIN_PLATFORM_DISTANCE,
-    PLATFORM_HEIGHT,
-    PLATFORM_WIDTH,
+    MAX_TICKS_PER_FRAME,
+    PLAYER_IMAGE,
+    PLAYER_SIZE,
     SCREEN_HEIGHT,
     SCREEN_WIDTH,
+    SNAPSHOT_INTERVAL,
+    TICK_RATE,
 )
+from display import SCALE_MODES, Display, parse_size
+from frame_pacing import FramePacer, LatencyMeter
+from game_logging import setup_logging
+from game_state import GameState
 from high_score_label import HighScoreLabel
-from platform_sprite import Platform
-
-# Initialize Pygame
-pygame.init()
-
-screen: pygame.Surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+from profiler import FrameProfiler, ProfilerOverlay
+from renderer import Renderer
+from replay import Recording, replay_headless
+from run_history import Run, RunHistory, language_code
+from snapshot import SnapshotFile, restore, snapshot
+from telemetry import TelemetryServer
+from text_cache import get_font, render_text
+
+# The window is only opened when running the game, so importing this module stays headless.
+# screen is the fixed-size surface everything is drawn into; display scales it to the window.
+screen: pygame.Surface
+display: Display
+run_history: RunHistory
 
 clock: pygame.time.Clock = pygame.time.Clock()
 
-platforms: List[Platform] = []
-high_score: int = 0
 player_max_y: int = SCREEN_HEIGHT
 passed_platforms: int = 0
 
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(module)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("game.log"), logging.StreamHandler()],
-)
-
 
 def load_localized_strings(language: str) -> dict:
     # Load the default English strings first
@@ -68,39 +77,26 @@ def load_localized_strings(language: str) -> dict:
     return strings
 
 
-def draw_platforms(camera: Camera) -> None:
-    for platform in platforms:
-        platform_rect: pygame.Rect = camera.apply(platform.rect)
-        screen.blit(platform.image, platform_rect)
-
-
-def add_platform() -> None:
-    # Randomly add a new platform
-    p_x: int = random.randint(0, SCREEN_WIDTH - PLATFORM_WIDTH)
-
-    # Calculate the vertical distance between platforms based on the constants
-    last_platform_y: int = platforms[-1].absolute_y
-    vertical_distance: int = random.randint(
-        MIN_PLATFORM_DISTANCE, MAX_PLATFORM_DISTANCE
-    )
-    p_y: int = last_platform_y - vertical_distance
-
-    platform: Platform = Platform(p_x, p_y, PLATFORM_WIDTH, PLATFORM_HEIGHT, absolute_y=p_y)
-    platforms.append(platform)
-
-
 def game_over_screen(strings: dict) -> None:
-    font: pygame.font.Font = pygame.font.Font(None, 36)
-    text: pygame.Surface = font.render(
-        strings.get("game_over"), True, (255, 0, 0)
-    )
+    text: pygame.Surface = render_text(strings.get("game_over"), 36, (255, 0, 0))
     text_rect: pygame.Rect = text.get_rect(
         center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
     )
     screen.blit(text, text_rect)
-    pygame.display.update()
-    pygame.time.wait(2000)  # Wait for 2 seconds
-    pygame.event.clear()  # Clear the event queue
+    display.update()
+
+    # Show the message for 2 seconds, asleep between events but still closable
+    deadline: int = pygame.time.get_ticks() + 2000
+    remaining: int = 2000
+    while remaining > 0:
+        event: pygame.event.Event = pygame.event.wait(remaining)
+        if event.type == pygame.QUIT:
+            logging.info("Quit event received. Application shutting down.")
+            pygame.quit()
+            sys.exit()
+        display.handle_event(event)
+        remaining = deadline - pygame.time.get_ticks()
+    pygame.event.clear()  # Drop keys pressed while the message was shown
 
 
 def wrap_text(text: str, font: pygame.font.Font, max_width: int) -> List[str]:
@@ -120,19 +116,17 @@ def wrap_text(text: str, font: pygame.font.Font, max_width: int) -> List[str]:
 
 
 def start_screen(strings: dict) -> None:
-    title_font: pygame.font.Font = pygame.font.Font(None, 48)
-    title_text: pygame.Surface = title_font.render(
-        strings.get("title"), True, (0, 0, 0)
-    )
+    # Fonts are shared and every line comes from the text cache, so idle frames rasterize nothing
+    title_text: pygame.Surface = render_text(strings.get("title"), 48, (0, 0, 0))
     title_rect: pygame.Rect = title_text.get_rect(
         center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4)
     )
 
-    instructions_font: pygame.font.Font = pygame.font.Font(None, 24)
+    instructions_font: pygame.font.Font = get_font(24)
     instructions_text: List[str] = strings.get("instructions")
     instructions_rects: List[pygame.Rect] = []
 
-    project_note_font: pygame.font.Font = pygame.font.Font(None, 18)
+    project_note_font: pygame.font.Font = get_font(18)
     project_note_text: str = strings.get("project_note")
     project_note_lines: List[str] = wrap_text(
         project_note_text, project_note_font, SCREEN_WIDTH - 40
@@ -166,25 +160,20 @@ def start_screen(strings: dict) -> None:
     # Calculate the vertical position of instructions
     instructions_y = title_rect.bottom + 20  # Adjust the spacing as needed
     for instruction in displayed_instructions:
-        instruction_surface = instructions_font.render(instruction, True, (0, 0, 0))
+        instruction_surface = render_text(instruction, 24, (0, 0, 0))
         instruction_rect = instruction_surface.get_rect(
             center=(SCREEN_WIDTH // 2, instructions_y)
         )
         instructions_rects.append(instruction_rect)
         instructions_y += instructions_font.get_height() + line_spacing
 
-    start_prompt = instructions_font.render(
-        strings.get("start_prompt"),
-        True,
-        (0, 0, 0),
-    )
+    start_prompt = render_text(strings.get("start_prompt"), 24, (0, 0, 0))
     start_prompt_rect = start_prompt.get_rect(
         center=(SCREEN_WIDTH // 2, instructions_y + 40)
     )
 
-    high_score_font: pygame.font.Font = pygame.font.Font(None, 36)
-    high_score_text: pygame.Surface = high_score_font.render(
-        f"{strings.get('high_score')}: {high_score}", True, (0, 0, 0)
+    high_score_text: pygame.Surface = render_text(
+        f"{strings.get('high_score')}: {run_history.best()}", 36, (0, 0, 0)
     )
     high_score_rect: pygame.Rect = high_score_text.get_rect(
         center=(SCREEN_WIDTH // 2, instructions_y + 80)
@@ -192,7 +181,7 @@ def start_screen(strings: dict) -> None:
 
     project_note_y = high_score_rect.bottom + 40  # Adjust the spacing as needed
     for line in project_note_lines:
-        project_note_surface = project_note_font.render(line, True, (0, 0, 0))
+        project_note_surface = render_text(line, 18, (0, 0, 0))
         project_note_rect = project_note_surface.get_rect(
             center=(SCREEN_WIDTH // 2, project_note_y)
         )
@@ -201,110 +190,191 @@ def start_screen(strings: dict) -> None:
             project_note_font.get_height() + 5
         )  # Adjust the line spacing as needed
 
-    pygame.event.clear()  # Clear the event queue before entering the loop
-
-    waiting_for_spacebar = True
-    while waiting_for_spacebar:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                logging.info("Quit event received. Application shutting down.")
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    logging.info("Spacebar pressed. Starting new game session.")
-                    waiting_for_spacebar = False
-                    break
-
+    def draw() -> None:
         screen.fill(LIGHT_BLUE)
         screen.blit(title_text, title_rect)
         for instruction, instruction_rect in zip(
             displayed_instructions, instructions_rects
         ):
-            screen.blit(
-                instructions_font.render(instruction, True, (0, 0, 0)), instruction_rect
-            )
+            screen.blit(render_text(instruction, 24, (0, 0, 0)), instruction_rect)
         screen.blit(start_prompt, start_prompt_rect)
-        high_score_text = high_score_font.render(
-            f"{strings.get('high_score')}: {high_score}", True, (0, 0, 0)
-        )  # Update high score text
         screen.blit(high_score_text, high_score_rect)
         for line, project_note_rect in zip(project_note_lines, project_note_rects):
-            screen.blit(
-                project_note_font.render(line, True, (0, 0, 0)), project_note_rect
-            )
-
-        pygame.display.update()
-        clock.tick(FPS)
+            screen.blit(render_text(line, 18, (0, 0, 0)), project_note_rect)
+        display.update()
 
+    pygame.event.clear()  # Clear the event queue before entering the loop
 
-def game(strings: dict, high_score: int) -> int:
-    global platforms
-    running: bool = True
-    score: int = 0
-    passed_platforms: int = 0
-    last_platform_jumped: Optional[Platform] = (
-        None  # Initialize last_platform_jumped to None
+    # The menu has no animations, so it is drawn once and the process sleeps
+    # until an event arrives. Nothing can set a new high score while it waits.
+    draw()
+    mark_startup("first frame")
+    waiting_for_spacebar = True
+    while waiting_for_spacebar:
+        event: pygame.event.Event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            logging.info("Quit event received. Application shutting down.")
+            pygame.quit()
+            sys.exit()
+        display.handle_event(event)  # Resizes and exposes present the menu again from screen
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                logging.info("Spacebar pressed. Starting new game session.")
+                waiting_for_spacebar = False
+                break
+
+
+def positive_int(text: str) -> int:
+    # argparse type for counts that must be at least 1; errors go through parser.error()
+    try:
+        value: int = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def save_recording(recording: Recording, record_dir: str) -> None:
+    os.makedirs(record_dir, exist_ok=True)
+    path: str = os.path.join(
+        record_dir, f"session-{time.strftime('%Y%m%d-%H%M%S')}-{recording.seed}.fjr"
     )
-
-    logging.info("Game session started.")
-
-    # Reset game state
-    player: Character = Character(
-        80, [SCREEN_WIDTH // 2, SCREEN_HEIGHT - 80], "frog.png"
+    recording.save(path)
+    logging.info("Session recording written to %s (%d ticks).", path, len(recording))
+
+
+def game(
+    strings: dict,
+    high_score: int,
+    render_fps: int = FPS,
+    profile_path: Optional[str] = None,
+    record_dir: Optional[str] = None,
+    replay: Optional[Recording] = None,
+    telemetry: Optional[TelemetryServer] = None,
+    capture_dir: Optional[str] = None,
+    capture_format: str = "raw",
+    capture_every: int = 1,
+    low_latency: bool = False,
+    snapshots: Optional[SnapshotFile] = None,
+    resume: Optional[GameState] = None,
+) -> GameState:
+    player_direction: int = 0
+    tick_seconds: float = 1 / TICK_RATE
+    accumulator: float = 0.0
+
+    state: GameState
+    if resume is not None:
+        # A session left behind by the previous launch continues where it was
+        state = resume
+        state.high_score = max(state.high_score, high_score)
+        logging.info("Game session resumed with seed %d at tick %d.", state.world.seed, state.ticks)
+    else:
+        # Every session gets an explicit seed so it can be recorded and replayed
+        state = GameState(
+            seed=replay.seed if replay is not None else random.randrange(2**63),
+            high_score=high_score,
+            prefetch=True,
+        )
+        logging.info("Game session started with seed %d.", state.world.seed)
+    seed: int = state.world.seed
+    # A recording has to start at the first tick, so resumed sessions are not recorded
+    recording: Optional[Recording] = (
+        Recording(seed) if record_dir is not None and state.ticks == 0 else None
     )
-    player_x_change: float = 0
-    player_y_change: float = 0
-    platforms = [
-        Platform(
-            SCREEN_WIDTH // 2 - PLATFORM_WIDTH // 2,
-            SCREEN_HEIGHT - PLATFORM_HEIGHT,
-            PLATFORM_WIDTH,
-            PLATFORM_HEIGHT,
+    capture: Optional[FrameCapture] = None
+    if capture_dir is not None:
+        os.makedirs(capture_dir, exist_ok=True)
+        capture_name: str = f"session-{time.strftime('%Y%m%d-%H%M%S')}-{seed}"
+        capture = FrameCapture(
+            os.path.join(capture_dir, capture_name + (".raw" if capture_format == "raw" else "")),
+            screen,
+            render_fps,
+            capture_format,
+            capture_every,
         )
-    ]
-    Platform.reset_id()  # Reset platform IDs when starting a new game
-
-    camera: Camera = Camera(player)  # Create a camera instance
+    player: Character = state.player
+    camera: Camera = state.camera
 
     # Create overlay elements
-    font: pygame.font.Font = pygame.font.Font(None, 36)
     score_label: HighScoreLabel = HighScoreLabel(
         10,
         10,
-        font,
+        36,
         (0, 0, 0),
         strings.get("score"),
         strings.get("high_score"),
     )
-    overlay_elements: pygame.sprite.Group = pygame.sprite.Group(score_label)
-
-    # Generate initial platforms
-    while len(platforms) < 6:  # Adjust the number of initial platforms as needed
-        add_platform()
-
-    # Set player's starting position on the second platform
-    player.rect.bottomleft = (SCREEN_WIDTH // 2, platforms[1].rect.top)
+    overlay_elements: List[pygame.sprite.Sprite] = [score_label]
+    renderer: Renderer = Renderer(screen, LIGHT_BLUE)
+    renderer.present = display.update
+
+    # Phase timing is only set up with --profile, so a normal game pays nothing for it
+    profiler: Optional[FrameProfiler] = None
+    profiler_overlay: Optional[ProfilerOverlay] = None
+    if profile_path is not None:
+        profiler = FrameProfiler()
+        profiler_overlay = ProfilerOverlay(profiler, get_font(18))
+        overlay_elements.append(profiler_overlay)
+        state.profiler = profiler
+        renderer.profiler = profiler
+
+    # Low-latency mode sleeps before reading input rather than after presenting
+    pacer: Optional[FramePacer] = FramePacer(render_fps, display.refresh_interval) if low_latency else None
+    latency: Optional[LatencyMeter] = (
+        LatencyMeter(profiler) if low_latency or profiler is not None else None
+    )
 
-    while running:
-        # Game over condition
-        if player.rect.top > camera.offset_y + SCREEN_HEIGHT:
+    previous_time: float = time.perf_counter()
+    while True:
+        # Game over condition; a replay also ends when its inputs run out
+        if state.game_over or (replay is not None and state.ticks >= len(replay)):
             logging.info("Game over")
+            if profiler is not None:
+                profiler.dump(profile_path)
+            if recording is not None:
+                save_recording(recording, record_dir)
+            if capture is not None:
+                capture.close()
+            if latency is not None:
+                latency.flush()
+            if snapshots is not None:
+                snapshots.clear()  # A finished session is not resumed
             game_over_screen(strings)
-            return high_score  # Return the updated high score when the game is over
-
+            return state  # The caller records the finished run
+
+        if pacer is not None:
+            pacer.wait()
+            if profiler is not None:
+                profiler.mark("sleep")
+        if latency is not None:
+            latency.polled()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 logging.info("Quit event received. Application shutting down.")
+                if profiler is not None:
+                    profiler.dump(profile_path)
+                if recording is not None:
+                    save_recording(recording, record_dir)
+                if capture is not None:
+                    capture.close()
+                if latency is not None:
+                    latency.flush()
+                if snapshots is not None:
+                    snapshots.save(snapshot(state))
                 pygame.quit()
                 sys.exit()
+            if display.handle_event(event):
+                continue
+            if replay is not None:
+                continue  # Inputs come from the recording
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                    player_x_change = -5
+                    player_direction = -1
                     player.flip_horizontally("left")
                     logging.info("Left key pressed.")
                 if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                    player_x_change = 5
+                    player_direction = 1
                     player.flip_horizontally("right")
                     logging.info("Right key pressed.")
             if event.type == pygame.KEYUP:
@@ -314,105 +384,265 @@ def game(strings: dict, high_score: int) -> int:
                     or event.key == pygame.K_a
                     or event.key == pygame.K_d
                 ):
-                    player_x_change = 0
+                    player_direction = 0
                     logging.info("Left/Right key released.")
 
-        screen.fill(LIGHT_BLUE)  # Fill the screen with light blue color
+        if profiler is not None:
+            profiler.mark("events")
+
+        # Run physics at TICK_RATE no matter how fast frames are drawn
+        now: float = time.perf_counter()
+        accumulator += now - previous_time
+        previous_time = now
+        ticks: int = 0
+        while accumulator >= tick_seconds and not state.game_over:
+            if ticks == MAX_TICKS_PER_FRAME:
+                # Drop the backlog after a long stall instead of trying to catch up
+                logging.debug("Dropped %.3f s of physics after a stall", accumulator)
+                accumulator = 0.0
+                break
+            if replay is not None:
+                if state.ticks >= len(replay):
+                    break
+                player_direction = replay.directions[state.ticks]
+                if player_direction:
+                    player.flip_horizontally("right" if player_direction > 0 else "left")
+            state.step(player_direction)
+            if recording is not None:
+                recording.record(player_direction)
+            if telemetry is not None:
+                telemetry.publish(state)
+            if snapshots is not None and state.ticks % SNAPSHOT_INTERVAL == 0:
+                snapshots.save(snapshot(state))
+            accumulator -= tick_seconds
+            ticks += 1
+        if state.score != score_label.score:
+            score_label.update_score(state.score, state.high_score)
+        if profiler_overlay is not None:
+            profiler_overlay.update()
+
+        # Draw the player, platforms and overlay elements between the last two ticks
+        alpha: float = min(accumulator / tick_seconds, 1.0)
+        renderer.render(player, state.platforms, camera, overlay_elements, alpha)
+        mark_startup("first frame")
+        if capture is not None:
+            capture.capture(screen)
+            if profiler is not None:
+                profiler.mark("capture")
+
+        if latency is not None:
+            latency.presented(display.present_end)
+        if pacer is not None:
+            pacer.end_frame(display.present_start, display.present_end, display.refresh_interval)
+        else:
+            # With vsync, presenting already waits for the display
+            clock.tick(0 if display.vsync else render_fps)
 
-        # Update passed_platforms and high score only when the player jumps on a new higher platform
-        if (
-            last_platform_jumped is not None
-            and player.rect.bottom <= last_platform_jumped.rect.top
-        ):
-            highest_platform: Platform = max(
-                platforms, key=lambda platform: platform.rect.top
-            )
-            if (
-                last_platform_jumped.rect.top < highest_platform.rect.top
-                and not last_platform_jumped.passed
-            ):
-                passed_platforms += 1
-                last_platform_jumped.passed = True
-                logging.info(
-                    f"You have passed platform with ID {last_platform_jumped.id}"
-                )  # Log the passed platform ID
-                score = passed_platforms
-                if score > high_score:
-                    high_score = score
-                score_label.update_score(score, high_score)
-
-        # Gravity
-        player_y_change += GRAVITY
-        player.update(player_x_change, player_y_change, platforms)
-
-        # Keep the player within the screen boundaries
-        if player.rect.left < 0:
-            player.rect.left = 0
-        elif player.rect.right > SCREEN_WIDTH:
-            player.rect.right = SCREEN_WIDTH
-
-        # Collision detection
-        for platform in platforms:
-            if player.rect.colliderect(platform.rect):
-                if player_y_change > 0:  # Check if the player is falling
-                    player.rect.bottom = (
-                        platform.rect.top
-                    )  # Adjust the player's position to be on top of the platform
-                    player_y_change = player.jump()  # Make the character jump automatically when they fall onto a platform
-
-                    # Update last_platform_jumped only when jumping on a new higher platform
-                    if last_platform_jumped is None or platform.rect.top < last_platform_jumped.rect.top:
-                        last_platform_jumped = platform
-
-        # Add new platforms when the player reaches a certain height relative to the camera's offset
-        if player.rect.top < camera.offset_y + SCREEN_HEIGHT // 3:
-            add_platform()
-
-        # Remove platforms that are no longer visible on the screen
-        platforms = [
-            platform
-            for platform in platforms
-            if platform.rect.top < camera.offset_y + SCREEN_HEIGHT
-        ]
-
-        # Update camera
-        camera.update()
-
-        # Draw the player and platforms
-        player_rect: pygame.Rect = camera.apply(player.rect)
-        screen.blit(player.image, player_rect)
-        draw_platforms(camera)
-
-        # Draw overlay elements
-        overlay_elements.draw(screen)
-
-        pygame.display.update()
-        clock.tick(FPS)
-
-    return high_score  # Ensure high_score is returned if the loop exits
+        if profiler is not None:
+            profiler.mark("sleep")
+            profiler.end_frame()
 
 
 if __name__ == "__main__":
-    logging.info("Application launched.")
     parser: argparse.ArgumentParser = argparse.ArgumentParser(
         description="Frog Jump Game"
     )
     parser.add_argument(
-        "-l", "--language", default="en", help="Language code (default: en)"
+        "-l", "--language", type=language_code, default="en", help="Language code (default: en)"
     )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Increase logging level to DEBUG"
     )
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=FPS,
+        help=f"Frame rate to render at; physics always runs at {TICK_RATE} ticks per second (default: {FPS})",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.json",
+        default=None,
+        metavar="PATH",
+        help="Time each phase of the frame loop, show percentiles on screen and write a JSON report at the end of each game (default path: profile.json)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="DIR",
+        help="Save the seed and inputs of every session as a replay file in this directory",
+    )
+    parser.add_argument(
+        "--replay", metavar="PATH", help="Play back a recorded session instead of reading the keyboard"
+    )
+    parser.add_argument(
+        "--replay-speed",
+        choices=["realtime", "max"],
+        default="realtime",
+        help="Replay at normal speed in the window, or as fast as possible without rendering (default: realtime)",
+    )
+    parser.add_argument(
+        "--history",
+        default="runs.fjh",
+        metavar="PATH",
+        help="File that every finished run is appended to; the high score comes from it (default: runs.fjh)",
+    )
+    parser.add_argument(
+        "--capture",
+        metavar="DIR",
+        help="Record the frames of every session into this directory from a background thread",
+    )
+    parser.add_argument(
+        "--capture-format",
+        choices=CAPTURE_FORMATS,
+        default="raw",
+        help="Raw video file to encode with FFmpeg afterwards, or a PNG image sequence (default: raw)",
+    )
+    parser.add_argument(
+        "--capture-every",
+        type=positive_int,
+        default=1,
+        metavar="N",
+        help="Capture only every N-th frame, e.g. 2 for half the frame rate (default: 1)",
+    )
+    parser.add_argument(
+        "--telemetry",
+        nargs="?",
+        const="127.0.0.1:8765",
+        default=None,
+        metavar="ADDRESS",
+        help="Stream every tick to local spectators on HOST:PORT or unix:PATH; watch with telemetry.py (default address: 127.0.0.1:8765)",
+    )
+    parser.add_argument(
+        "--window",
+        type=parse_size,
+        metavar="WxH",
+        help=f"Initial window size; the game is drawn at {SCREEN_WIDTH}x{SCREEN_HEIGHT} and scaled to fit (default: {SCREEN_WIDTH}x{SCREEN_HEIGHT})",
+    )
+    parser.add_argument(
+        "--fullscreen", action="store_true", help="Start fullscreen at the desktop resolution; F11 toggles it"
+    )
+    parser.add_argument(
+        "--scale",
+        choices=SCALE_MODES,
+        default="nearest",
+        help="Scale the picture to the window with sharp pixel edges or bilinear smoothing (default: nearest)",
+    )
+    parser.add_argument(
+        "--integer-scale",
+        action="store_true",
+        help="Only scale by whole factors, leaving borders around the picture instead of uneven pixels",
+    )
+    parser.add_argument(
+        "--vsync",
+        action="store_true",
+        help="Present in step with the display's refresh, which then sets the frame rate; SDL scales the picture on the GPU",
+    )
+    parser.add_argument(
+        "--low-latency",
+        action="store_true",
+        help="Sleep before reading input instead of after drawing, so each frame shows the newest input; best with --vsync. Input-to-present latency is logged",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="PATH",
+        help="Keep a snapshot of the running session in this file and resume it on the next launch, e.g. after a kiosk restart",
+    )
+    parser.add_argument(
+        "--asset-cache",
+        metavar="DIR",
+        help="Keep scaled images in this directory so later launches skip decoding the originals",
+    )
     args: argparse.Namespace = parser.parse_args()
+    mark_startup("imports")
 
-    # Set logging level based on the verbose flag
-    if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
-    else:
-        logging.getLogger().setLevel(logging.INFO)
+    # Set logging level based on the verbose flag; records are written off the frame loop
+    setup_logging(logging.DEBUG if args.verbose else logging.INFO)
+    logging.info("Application launched.")
+
+    replay: Optional[Recording] = Recording.load(args.replay) if args.replay else None
+    if replay is not None and args.replay_speed == "max":
+        final_state, ticks_per_second = replay_headless(replay)
+        logging.info(
+            "Replay finished: %d ticks, score %d, %s, %.0f ticks/s.",
+            final_state.ticks,
+            final_state.score,
+            "game over" if final_state.game_over else "still alive",
+            ticks_per_second,
+        )
+        sys.exit()
+
+    # Initialize only the Pygame modules the game uses; there is no sound or joystick input
+    pygame.display.init()
+    pygame.font.init()
+
+    display = Display(args.window, args.scale, args.integer_scale, args.fullscreen, args.vsync)
+    screen = display.surface
+    mark_startup("window")
+
+    # Load the player sprite now, converted for the window, instead of when the first game starts
+    assets.cache_dir = args.asset_cache
+    assets.sprite(PLAYER_IMAGE, (PLAYER_SIZE, PLAYER_SIZE))
+    mark_startup("assets")
 
     language: str = args.language
     strings: dict = load_localized_strings(language)
+    run_history = RunHistory(args.history)
+    telemetry: Optional[TelemetryServer] = (
+        TelemetryServer(args.telemetry) if args.telemetry is not None else None
+    )
+    logging.info("Run history: %d runs, best score %d.", run_history.count, run_history.best())
+    if replay is not None:
+        game(
+            strings,
+            run_history.best(),
+            args.fps,
+            args.profile,
+            replay=replay,
+            telemetry=telemetry,
+            capture_dir=args.capture,
+            capture_format=args.capture_format,
+            capture_every=args.capture_every,
+            low_latency=args.low_latency,
+        )
+        pygame.quit()
+        sys.exit()
+    snapshots: Optional[SnapshotFile] = SnapshotFile(args.snapshot) if args.snapshot else None
+    resume: Optional[GameState] = None
+    saved: Optional[bytes] = snapshots.load() if snapshots is not None else None
+    if saved is not None:
+        # Restored before the menu would be skipped, so a bad snapshot still leads to the menu
+        try:
+            resume = restore(saved, prefetch=True)
+        except (ValueError, struct.error) as error:
+            logging.warning("Could not resume the saved session, starting from the menu: %s", error)
+            snapshots.clear()
     while True:
-        start_screen(strings)
-        high_score = game(strings, high_score)  # Store the updated high score
+        if resume is None:
+            start_screen(strings)
+        final_state: GameState = game(
+            strings,
+            run_history.best(),
+            args.fps,
+            args.profile,
+            args.record,
+            telemetry=telemetry,
+            capture_dir=args.capture,
+            capture_format=args.capture_format,
+            capture_every=args.capture_every,
+            low_latency=args.low_latency,
+            snapshots=snapshots,
+            resume=resume,
+        )
+        resume = None
+        # Queued for the history's writer thread, so the next screen never waits on the disk
+        run_history.add(
+            Run(
+                final_state.world.seed,
+                final_state.score,
+                final_state.passed_platforms,
+                final_state.ticks,
+                int(time.time()),
+                language,
+            )
+        )
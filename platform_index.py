@@ -0,0 +1,91 @@
+import bisect
+import itertools
+from typing import Iterator, List
+
+from platform_sprite import Platform
+
+COMPACT_AFTER: int = 64  # Culled platforms left at the front of the lists before they are dropped
+
+
+class PlatformIndex:
+    """Platforms ordered from the lowest (largest absolute_y) to the highest.
+
+    The level is generated bottom-up and platforms leave it from the
+    bottom, so platforms and their sort keys are kept in plain lists that
+    are appended to at the top, while pop_lowest() only moves a start
+    offset up. The culled entries below it are deleted in one go once
+    there are COMPACT_AFTER of them and they make up half the lists, so
+    culling stays amortized O(1). Indexing, len() and iteration keep the
+    bottom-to-top order, and vertical range queries are binary searches
+    over the keys.
+    """
+
+    def __init__(self) -> None:
+        self._platforms: List[Platform] = []
+        self._keys: List[int] = []  # -absolute_y, ascending
+        self._start: int = 0  # Index of the lowest live platform; everything before it is culled
+        self._max_height: int = 0
+
+    def __len__(self) -> int:
+        return len(self._platforms) - self._start
+
+    def __iter__(self) -> Iterator[Platform]:
+        return itertools.islice(self._platforms, self._start, None)
+
+    def __getitem__(self, index: int) -> Platform:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PlatformIndex index out of range")
+        return self._platforms[self._start + index]
+
+    def add(self, platform: Platform) -> None:
+        key: int = -platform.absolute_y
+        if len(self._keys) == self._start or key >= self._keys[-1]:
+            # New platforms are almost always generated above the others
+            self._keys.append(key)
+            self._platforms.append(platform)
+        else:
+            i: int = bisect.bisect_right(self._keys, key, self._start)
+            self._keys.insert(i, key)
+            self._platforms.insert(i, platform)
+        if platform.rect.height > self._max_height:
+            self._max_height = platform.rect.height
+
+    def lowest(self) -> Platform:
+        return self[0]
+
+    def highest(self) -> Platform:
+        return self[-1]
+
+    def pop_lowest(self) -> Platform:
+        platform: Platform = self[0]
+        self._start += 1
+        if self._start >= COMPACT_AFTER and self._start * 2 >= len(self._platforms):
+            del self._platforms[: self._start]
+            del self._keys[: self._start]
+            self._start = 0
+        return platform
+
+    def around(self, y: int, count: int) -> Iterator[Platform]:
+        """Yield `count` consecutive platforms centred on the lowest one above row y, lowest first.
+
+        Fewer are yielded only when the index holds fewer than `count`.
+        """
+        above: int = bisect.bisect_right(self._keys, -y, self._start)
+        end: int = len(self._platforms)
+        start: int = max(self._start, min(above - count // 2, end - count))
+        for i in range(start, min(start + count, end)):
+            yield self._platforms[i]
+
+    def overlapping(
+        self, top: int, bottom: int, highest_first: bool = False
+    ) -> Iterator[Platform]:
+        """Yield the platforms overlapping the rows [top, bottom), lowest first by default."""
+        start: int = bisect.bisect_right(self._keys, -bottom, self._start)
+        end: int = bisect.bisect_left(self._keys, self._max_height - top, self._start)
+        platforms: List[Platform] = self._platforms
+        for i in range(end - 1, start - 1, -1) if highest_first else range(start, end):
+            platform: Platform = platforms[i]
+            if platform.rect.top < bottom and platform.rect.bottom > top:
+                yield platform
@@ -1,24 +1,35 @@
 import logging
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import pygame
 
 from constants import DARK_BROWN
+from game_logging import AggregatedLog
 
-class Platform(pygame.sprite.Sprite):
-    next_id: int = 1  # Class variable to keep track of the next available platform ID
+_generation_log: AggregatedLog = AggregatedLog("platforms generated")
 
-    def __init__(self, x: int, y: int, width: int, height: int, absolute_y: Optional[int] = None):
-        super().__init__()
-        self.image: pygame.Surface = pygame.Surface((width, height))
-        self.image.fill(DARK_BROWN)
+
+class Platform:
+    __slots__ = ("image", "rect", "absolute_y", "passed", "id")
+
+    _surfaces: Dict[Tuple[int, int, Tuple[int, int, int]], pygame.Surface] = {}
+
+    def __init__(
+        self, x: int, y: int, width: int, height: int, platform_id: int, absolute_y: Optional[int] = None
+    ):
+        self.image: pygame.Surface = Platform.shared_surface(width, height, DARK_BROWN)
         self.rect: pygame.Rect = self.image.get_rect(topleft=(x, y))
+        self.place(x, y, platform_id, absolute_y)
+
+    def place(self, x: int, y: int, platform_id: int, absolute_y: Optional[int] = None) -> None:
+        # Also called by World to reuse a culled platform as a newly generated one of the same size
+        self.rect.topleft = (x, y)
         self.absolute_y: int = absolute_y if absolute_y is not None else y  # Store the absolute y position
         self.passed: bool = False  # Track if the platform has been passed
-        self.id: int = Platform.next_id  # Assign a unique ID to each platform
-        Platform.next_id += 1  # Increment the next available platform ID
-        logging.info(
-            f"Generating platform with ID {self.id} at absolute position {self.absolute_y}"
+        self.id: int = platform_id  # Unique within the World that generated it
+        _generation_log.record()
+        logging.debug(
+            "Generating platform with ID %d at absolute position %d", self.id, self.absolute_y
         )  # Log the platform generation with absolute position
 
     def passed_by_player(self, player_last_platform: Optional["Platform"]) -> bool:
@@ -28,5 +39,38 @@ class Platform(pygame.sprite.Sprite):
         return False
 
     @classmethod
-    def reset_id(cls) -> None:
-        cls.next_id = 1  # Reset the next available platform ID to 1
+    def shared_surface(
+        cls, width: int, height: int, color: Tuple[int, int, int]
+    ) -> pygame.Surface:
+        # All platforms of the same size and color draw the same surface
+        key: Tuple[int, int, Tuple[int, int, int]] = (width, height, color)
+        surface: Optional[pygame.Surface] = cls._surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface((width, height))
+            surface.fill(color)
+            cls._surfaces[key] = surface
+        return surface
+
+    @classmethod
+    def restore(
+        cls,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        platform_id: int,
+        passed: bool,
+        platform: Optional["Platform"] = None,
+    ) -> "Platform":
+        # Rebuild a platform from a snapshot, keeping its ID and without counting it as generated;
+        # a released platform may be passed in to be overwritten instead of allocating one
+        if platform is None:
+            platform = cls.__new__(cls)
+            platform.rect = pygame.Rect(x, y, width, height)
+        else:
+            platform.rect.update(x, y, width, height)
+        platform.image = cls.shared_surface(width, height, DARK_BROWN)
+        platform.absolute_y = y
+        platform.passed = passed
+        platform.id = platform_id
+        return platform
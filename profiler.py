@@ -0,0 +1,144 @@
+import json
+import logging
+import time
+from array import array
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+import pygame
+
+from constants import LIGHT_BLUE, SCREEN_WIDTH
+
+# Phases of a frame in the order main.game() goes through them
+PHASES: Tuple[str, ...] = (
+    "events",
+    "physics",
+    "collision",
+    "platforms",
+    "camera",
+    "drawing",
+    "display",
+    "capture",
+    "sleep",
+)
+# Per-frame values that are not phases: the whole frame time, and the
+# input-to-present latency. Frames that never set one are left out of its
+# percentiles, since a frame that presented nothing has no latency.
+MEASUREMENTS: Tuple[str, ...] = ("frame", "latency")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    index: int = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """Times each phase of the frame loop.
+
+    Code under measurement calls mark(phase) when it finishes a phase; the
+    time since the previous mark is added to that phase for the current
+    frame. Phases that run several times per frame, like physics during
+    catch-up, are summed. Per-frame totals go into a rolling window for the
+    overlay and into a full-session history for the JSON report.
+    """
+
+    def __init__(self, window: int = 600):
+        self.window: Deque[Dict[str, float]] = deque(maxlen=window)
+        self.history: Dict[str, array] = {phase: array("d") for phase in PHASES + MEASUREMENTS}
+        self._frame: Dict[str, float] = dict.fromkeys(PHASES + MEASUREMENTS, 0.0)
+        self._frame_start: float = time.perf_counter()
+        self._last: float = self._frame_start
+
+    def mark(self, phase: str) -> None:
+        now: float = time.perf_counter()
+        self._frame[phase] += now - self._last
+        self._last = now
+
+    def measure(self, name: str, seconds: float) -> None:
+        # Set a per-frame value from MEASUREMENTS for the current frame
+        self._frame[name] = seconds
+
+    def end_frame(self) -> None:
+        now: float = time.perf_counter()
+        frame: Dict[str, float] = self._frame
+        frame["frame"] = now - self._frame_start
+        self.window.append(frame)
+        for phase, seconds in frame.items():
+            self.history[phase].append(seconds)
+        self._frame = dict.fromkeys(PHASES + MEASUREMENTS, 0.0)
+        self._frame_start = now
+        self._last = now
+
+    def rolling_percentiles(self) -> Dict[str, Tuple[float, float, float]]:
+        """Return (p50, p95, p99) in milliseconds per phase over the rolling window."""
+        result: Dict[str, Tuple[float, float, float]] = {}
+        for phase in PHASES + MEASUREMENTS:
+            values: List[float] = sorted(
+                frame[phase] * 1000 for frame in self.window if frame[phase] or phase in PHASES
+            )
+            result[phase] = (
+                percentile(values, 0.50),
+                percentile(values, 0.95),
+                percentile(values, 0.99),
+            )
+        return result
+
+    def report(self) -> dict:
+        """Summarize the whole session in milliseconds."""
+        phases: dict = {}
+        for phase, samples in self.history.items():
+            values: List[float] = sorted(
+                seconds * 1000 for seconds in samples if seconds or phase in PHASES
+            )
+            phases[phase] = {
+                "mean": sum(values) / len(values) if values else 0.0,
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "p99": percentile(values, 0.99),
+                "max": values[-1] if values else 0.0,
+            }
+        return {"frames": len(self.history["frame"]), "phases_ms": phases}
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=4)
+        logging.info("Profile report written to %s", path)
+
+
+class ProfilerOverlay(pygame.sprite.Sprite):
+    """Small table of rolling p50/p95/p99 phase times, drawn beside the score."""
+
+    def __init__(self, profiler: FrameProfiler, font: pygame.font.Font, refresh_frames: int = 30):
+        super().__init__()
+        self.profiler: FrameProfiler = profiler
+        self.font: pygame.font.Font = font
+        self.refresh_frames: int = refresh_frames
+        self._frames: int = 0
+        self.update_text()
+
+    def update_text(self) -> None:
+        lines: List[str] = ["phase  p50/p95/p99 ms"]
+        for phase, (p50, p95, p99) in self.profiler.rolling_percentiles().items():
+            lines.append(f"{phase}: {p50:.1f}/{p95:.1f}/{p99:.1f}")
+        rendered: List[pygame.Surface] = [
+            self.font.render(line, True, (0, 0, 0)) for line in lines
+        ]
+        self.image: pygame.Surface = pygame.Surface(
+            (max(text.get_width() for text in rendered), sum(text.get_height() for text in rendered))
+        )
+        self.image.fill(LIGHT_BLUE)
+        y: int = 0
+        for text in rendered:
+            self.image.blit(text, (0, y))
+            y += text.get_height()
+        self.rect: pygame.Rect = self.image.get_rect(topright=(SCREEN_WIDTH - 10, 10))
+
+    def update(self) -> None:
+        # Re-render only every refresh_frames frames; the numbers are unreadable faster
+        self._frames += 1
+        if self._frames >= self.refresh_frames:
+            self._frames = 0
+            self.update_text()
@@ -0,0 +1,116 @@
+import functools
+from typing import List, Tuple
+
+import numpy as np
+
+import constants
+from constants import PLATFORM_HEIGHT, PLATFORM_WIDTH, PLAYER_SIZE
+
+# Player lefts that overlap a platform span PLAYER_SIZE + PLATFORM_WIDTH - 1
+# pixels, so a platform whose left edge is this much further along is
+# still reached without any horizontal movement
+OVERLAP_SLACK: int = PLAYER_SIZE + PLATFORM_WIDTH - 2
+
+
+def jump_arc(gravity: float, jump_velocity: float) -> List[Tuple[int, bool]]:
+    """Height of the player's bottom above the take-off platform after each tick of a jump.
+
+    Follows GameState.step(): the jump leaves the player one pixel above
+    the platform, then every tick adds gravity to the vertical speed and
+    moves the rect by it, truncated like Rect.move_ip(). Each entry is
+    (height, falling); the arc ends once the player is too far below the
+    take-off platform to land on anything at or above it.
+    """
+    if gravity <= 0:
+        raise ValueError("The player only comes back down with a positive GRAVITY")
+    arc: List[Tuple[int, bool]] = []
+    height: int = 1
+    speed: float = jump_velocity
+    while height > -(PLAYER_SIZE + PLATFORM_HEIGHT):
+        speed += gravity
+        height -= int(speed)
+        arc.append((height, speed > 0))
+    return arc
+
+
+class ReachabilityTable:
+    """Which platform placements a jump can land on, for one set of physics.
+
+    table[gap, offset] is True when a platform `gap` pixels above the one
+    the player jumps from, with its left edge `offset` pixels to either
+    side, can be landed on. A landing is what GameState.resolve_collisions()
+    accepts: while falling, the swept player rect overlaps the platform's
+    rows and its columns. Horizontally the player may steer at PLAYER_SPEED
+    from any position on the take-off platform, so a placement is reachable
+    if some falling tick that overlaps the platform's rows comes late
+    enough to have covered the offset. Gaps above the highest reachable one
+    are not stored and are never reachable.
+    """
+
+    def __init__(self, gravity: float, jump_velocity: float, speed: int, max_offset: int):
+        self.gravity: float = gravity
+        self.jump_velocity: float = jump_velocity
+        self.speed: int = speed
+        self.max_offset: int = max_offset
+
+        # Latest falling tick at which the player overlaps the rows of a platform at each gap
+        arc: List[Tuple[int, bool]] = jump_arc(gravity, jump_velocity)
+        latest: List[int] = []
+        gap: int = 0
+        while True:
+            last: int = -1
+            previous: int = 1
+            for tick, (height, falling) in enumerate(arc, 1):
+                if falling and height < gap and max(height + PLAYER_SIZE, previous) > gap - PLATFORM_HEIGHT:
+                    last = tick
+                previous = height
+            if last < 0:
+                break
+            latest.append(last)
+            gap += 1
+
+        offsets: np.ndarray = np.arange(max_offset + 1)
+        self.table: np.ndarray = (
+            np.maximum(offsets[None, :] - OVERLAP_SLACK, 0)
+            <= speed * np.array(latest, dtype=np.int64)[:, None]
+        )
+        self._rows: List[bytes] = [row.tobytes() for row in self.table]
+        # Reachable offsets at a gap always run from 0 up to some limit, so that limit describes the row
+        self._widest: List[int] = [int(row.sum()) - 1 for row in self.table]
+
+    @property
+    def max_gap(self) -> int:
+        """Largest gap that can be reached at all, straight up."""
+        return len(self._rows) - 1
+
+    def reachable(self, gap: int, offset: int) -> bool:
+        offset = abs(offset)
+        return 0 <= gap < len(self._rows) and offset <= self.max_offset and self._rows[gap][offset] != 0
+
+    def widest_offset(self, gap: int) -> int:
+        """Largest horizontal offset reachable at a gap, or -1 if the gap cannot be reached."""
+        return self._widest[gap] if 0 <= gap < len(self._widest) else -1
+
+    def reachable_all(self, gaps: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """reachable() over whole arrays of gaps and offsets at once."""
+        offsets = np.abs(offsets)
+        inside: np.ndarray = (gaps >= 0) & (gaps < len(self._rows)) & (offsets <= self.max_offset)
+        return inside & self.table[
+            np.clip(gaps, 0, len(self._rows) - 1), np.clip(offsets, 0, self.max_offset)
+        ]
+
+
+@functools.lru_cache(maxsize=None)
+def _table(gravity: float, jump_velocity: float, speed: int, max_offset: int) -> ReachabilityTable:
+    return ReachabilityTable(gravity, jump_velocity, speed, max_offset)
+
+
+def reachability_table(width: int = constants.SCREEN_WIDTH) -> ReachabilityTable:
+    """The table for the current physics constants, built once per set of values.
+
+    Constants are read on every call, so parameter sweeps that change them
+    get a matching table.
+    """
+    return _table(
+        constants.GRAVITY, constants.JUMP_VELOCITY, constants.PLAYER_SPEED, width - PLATFORM_WIDTH
+    )
@@ -0,0 +1,132 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import pygame
+
+from camera import Camera
+from character import Character
+from constants import SCREEN_HEIGHT
+from platform_index import PlatformIndex
+from profiler import FrameProfiler
+
+
+class Renderer:
+    """Draws a game frame with one batched blit and partial display updates.
+
+    Screen rects are kept in a pool and rewritten in place every frame. While
+    the camera stays put, only the areas of sprites that moved or changed
+    their image are cleared and pushed to the display; when it scrolls, the
+    whole window is redrawn.
+    """
+
+    def __init__(self, screen: pygame.Surface, background: Tuple[int, int, int]):
+        self.screen: pygame.Surface = screen
+        self.background: Tuple[int, int, int] = background
+        self._entries: List[List] = []  # Pooled [surface, screen rect] pairs, reused every frame
+        self._blit_sequence: List[List] = []  # The first _count entries, as handed to blits()
+        self._previous_rects: List[pygame.Rect] = []
+        self._previous_images: List[pygame.Surface] = []
+        self._changed: List[bool] = []  # Images redrawn in place since the last frame
+        self._count: int = 0
+        self._previous_count: int = -1
+        self._previous_offset: int = 0
+        self._dirty_rects: List[pygame.Rect] = []
+        self.profiler: Optional[FrameProfiler] = None  # Set to time drawing and display updates
+        # Pushes the whole screen, or a list of changed rects, to the window; Display.update when scaling
+        self.present: Callable[..., None] = pygame.display.update
+
+    def _queue(self, image: pygame.Surface, changed: bool = False) -> pygame.Rect:
+        # Return the pooled rect for the next slot, growing the pool when needed
+        if self._count == len(self._entries):
+            self._entries.append([image, pygame.Rect(0, 0, 0, 0)])
+            self._previous_rects.append(pygame.Rect(0, 0, 0, 0))
+            self._previous_images.append(image)
+            self._changed.append(False)
+        entry: List = self._entries[self._count]
+        if self._count == len(self._blit_sequence):
+            self._blit_sequence.append(entry)
+        entry[0] = image
+        self._changed[self._count] = changed
+        self._count += 1
+        return entry[1]
+
+    def begin_frame(self) -> None:
+        # Start queueing a new frame; pooled rects and sequence entries are reused
+        self._count = 0
+
+    def draw_player(self, player: Character, camera: Camera, alpha: float = 1.0) -> None:
+        rect: pygame.Rect = self._queue(player.image)
+        rect.size = player.rect.size
+        rect.topleft = player.interpolated_topleft(alpha)
+        rect.y += int(-camera.interpolated_offset(alpha))
+
+    def draw_platforms(
+        self, platforms: PlatformIndex, camera: Camera, alpha: float = 1.0
+    ) -> None:
+        # Only platforms inside the window are queued
+        offset: int = int(-camera.interpolated_offset(alpha))
+        for platform in platforms.overlapping(-offset, SCREEN_HEIGHT - offset):
+            camera.apply_ip(platform.rect, self._queue(platform.image), alpha)
+
+    def draw_overlays(self, overlays: Sequence[pygame.sprite.Sprite]) -> None:
+        # Overlays may redraw their image in place and flag it through a DirtySprite-style dirty attribute
+        for sprite in overlays:
+            self._queue(sprite.image, bool(getattr(sprite, "dirty", 0))).update(sprite.rect)
+            if hasattr(sprite, "dirty"):
+                sprite.dirty = 0
+
+    def render(
+        self,
+        player: Character,
+        platforms: PlatformIndex,
+        camera: Camera,
+        overlays: Sequence[pygame.sprite.Sprite],
+        alpha: float = 1.0,
+    ) -> None:
+        """Draw the frame, interpolated alpha of the way into the last tick, and push it to the display."""
+        self.begin_frame()
+        self.draw_player(player, camera, alpha)
+        self.draw_platforms(platforms, camera, alpha)
+        self.draw_overlays(overlays)
+
+        count: int = self._count
+        sequence: List[List] = self._blit_sequence
+        del sequence[count:]  # Drop entries left over from a frame with more sprites, in place
+        offset: int = int(-camera.interpolated_offset(alpha))
+
+        profiler: Optional[FrameProfiler] = self.profiler
+        if offset != self._previous_offset or count != self._previous_count:
+            self.screen.fill(self.background)
+            self.screen.blits(sequence, doreturn=False)
+            if profiler is not None:
+                profiler.mark("drawing")
+            self.present()
+        else:
+            dirty_rects: List[pygame.Rect] = self._dirty_rects
+            dirty_rects.clear()
+            for i in range(count):
+                image, rect = sequence[i]
+                previous_rect: pygame.Rect = self._previous_rects[i]
+                if (
+                    rect != previous_rect
+                    or image is not self._previous_images[i]
+                    or self._changed[i]
+                ):
+                    dirty_rects.append(previous_rect)
+                    dirty_rects.append(rect)
+            if dirty_rects:
+                # Clear the old positions, then redraw everything so overlaps stay correct
+                for i in range(0, len(dirty_rects), 2):
+                    self.screen.fill(self.background, dirty_rects[i])
+                self.screen.blits(sequence, doreturn=False)
+                if profiler is not None:
+                    profiler.mark("drawing")
+                self.present(dirty_rects)
+
+        for i in range(count):
+            image, rect = sequence[i]
+            self._previous_rects[i].update(rect)
+            self._previous_images[i] = image
+        self._previous_count = count
+        self._previous_offset = offset
+        if profiler is not None:
+            profiler.mark("display")
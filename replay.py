@@ -0,0 +1,95 @@
+import struct
+import time
+from array import array
+from typing import Iterator, Tuple
+
+from game_state import GameState
+
+# File layout: header, then one varint per run of identical inputs holding
+# (run length << 2) | (direction + 1). Players hold a direction for many
+# ticks, so a minute of play usually takes a few hundred bytes.
+MAGIC: bytes = b"FJRP"
+VERSION: int = 2  # 2: levels come from the chunked World generator
+HEADER: struct.Struct = struct.Struct("<4sBqI")  # magic, version, seed, tick count
+
+
+class Recording:
+    """RNG seed of a session plus the horizontal input of every tick."""
+
+    def __init__(self, seed: int):
+        self.seed: int = seed
+        self.directions: array = array("b")  # -1, 0 or 1 per tick
+
+    def __len__(self) -> int:
+        return len(self.directions)
+
+    def record(self, direction: int) -> None:
+        self.directions.append(direction)
+
+    def runs(self) -> Iterator[Tuple[int, int]]:
+        """Yield (direction, length) for each run of identical inputs."""
+        if not self.directions:
+            return
+        current: int = self.directions[0]
+        length: int = 0
+        for direction in self.directions:
+            if direction == current:
+                length += 1
+            else:
+                yield current, length
+                current = direction
+                length = 1
+        yield current, length
+
+    def to_bytes(self) -> bytes:
+        data: bytearray = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, len(self)))
+        for direction, length in self.runs():
+            value: int = (length << 2) | (direction + 1)
+            while value >= 0x80:
+                data.append((value & 0x7F) | 0x80)
+                value >>= 7
+            data.append(value)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Recording":
+        magic, version, seed, ticks = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a Frog Jump recording or unsupported version")
+        recording: Recording = cls(seed)
+        value: int = 0
+        shift: int = 0
+        for byte in data[HEADER.size:]:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                recording.directions.extend(array("b", [(value & 3) - 1]) * (value >> 2))
+                value = 0
+                shift = 0
+        if len(recording) != ticks:
+            raise ValueError("Recording is truncated")
+        return recording
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+def replay_headless(recording: Recording) -> Tuple[GameState, float]:
+    """Re-run a recording with no display or frame cap.
+
+    Returns the final state and the ticks simulated per second.
+    """
+    state: GameState = GameState(seed=recording.seed, image_path=None)
+    start: float = time.perf_counter()
+    for direction in recording.directions:
+        if state.game_over:
+            break
+        state.step(direction)
+    elapsed: float = time.perf_counter() - start
+    return state, state.ticks / elapsed if elapsed > 0 else 0.0
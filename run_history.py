@@ -0,0 +1,228 @@
+import atexit
+import bisect
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from typing import BinaryIO, List, NamedTuple, Optional, Tuple
+
+MAGIC: bytes = b"FJRH"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sB")  # magic, version
+# seed, score, passed platforms, duration in ticks, finish time (Unix seconds), language code
+RECORD: struct.Struct = struct.Struct("<qIIIq8s")
+
+INDEX_MAGIC: bytes = b"FJRI"
+INDEX_HEADER: struct.Struct = struct.Struct("<4sBQI")  # magic, version, runs covered, entries
+INDEX_ENTRY: struct.Struct = struct.Struct("<IQ")  # score, run number
+
+TOP_K: int = 100  # Best runs kept in the index
+
+
+class Run(NamedTuple):
+    seed: int
+    score: int
+    passed_platforms: int
+    ticks: int
+    finished_at: int
+    language: str
+
+
+def language_code(text: str) -> str:
+    """Check that a language code fits a run record: ASCII and at most 8 characters."""
+    if not text.isascii() or len(text) > 8:
+        raise ValueError(f"Language code must be at most 8 ASCII characters, got {text!r}")
+    return text
+
+
+def _insert(top: List[Tuple[int, int]], score: int, number: int, limit: int) -> None:
+    # Entries are (-score, run number), so the list is best first and ties go to the earlier run
+    entry: Tuple[int, int] = (-score, number)
+    if len(top) < limit or entry < top[-1]:
+        bisect.insort(top, entry)
+        del top[limit:]
+
+
+class RunHistory:
+    """Append-only store of finished runs with an index of the best ones.
+
+    Runs are fixed-size records in one file, so run N sits at a known
+    offset and millions of runs take a few tens of megabytes. A sidecar
+    index file holds the top_k best (score, run number) pairs and how many
+    runs it covers, so opening the history, best() and top() never scan
+    the whole file. Only runs appended after the index was last written,
+    e.g. by a crash between the two writes, are re-read when opening.
+
+    add() packs the run and queues the record; a background thread appends
+    everything queued in one write, fsyncs it and then replaces the index.
+    """
+
+    def __init__(self, path: str, top_k: int = TOP_K):
+        self.path: str = path
+        self.index_path: str = f"{path}.idx"
+        self.top_k: int = top_k
+        self.count: int = 0  # Runs added, including ones not written yet
+        self._top: List[Tuple[int, int]] = []
+        self._file: BinaryIO = self._open()  # Appended to by the writer thread only
+        self._reader: BinaryIO = open(path, "rb")
+        self._load_index()
+        self._written_top: List[Tuple[int, int]] = list(self._top)  # Only runs already on disk
+        self._queue: "queue.Queue[Optional[Tuple[int, bytes]]]" = queue.Queue()  # (score, record)
+        self._writer: threading.Thread = threading.Thread(
+            target=self._write_loop, name="run-history", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _open(self) -> BinaryIO:
+        if not os.path.exists(self.path):
+            with open(self.path, "wb") as file:
+                file.write(HEADER.pack(MAGIC, VERSION))
+        file: BinaryIO = open(self.path, "r+b")
+        magic, version = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            file.close()
+            raise ValueError(f"{self.path} is not a Frog Jump run history or has an unsupported version")
+
+        size: int = file.seek(0, os.SEEK_END)
+        self.count = (size - HEADER.size) // RECORD.size
+        end: int = HEADER.size + self.count * RECORD.size
+        if end != size:
+            # A write was cut off part way through a record; drop the partial record
+            logging.warning("Dropping %d trailing bytes from %s", size - end, self.path)
+            file.truncate(end)
+            file.seek(end)
+        return file
+
+    def _load_index(self) -> None:
+        covered: int = 0
+        try:
+            with open(self.index_path, "rb") as file:
+                data: bytes = file.read()
+            magic, version, covered, entries = INDEX_HEADER.unpack_from(data)
+            if magic != INDEX_MAGIC or version != VERSION or covered > self.count:
+                raise ValueError("stale index")
+            for score, number in INDEX_ENTRY.iter_unpack(
+                data[INDEX_HEADER.size:INDEX_HEADER.size + entries * INDEX_ENTRY.size]
+            ):
+                _insert(self._top, score, number, self.top_k)
+        except (OSError, ValueError, struct.error):
+            covered = 0
+            self._top.clear()
+
+        if covered < self.count:
+            logging.info("Indexing %d runs in %s", self.count - covered, self.path)
+            for number in range(covered, self.count):
+                _insert(self._top, self.read(number).score, number, self.top_k)
+
+    def read(self, number: int) -> Run:
+        """Return run `number` (0 is the first run ever added) from disk."""
+        self._reader.seek(HEADER.size + number * RECORD.size)
+        seed, score, passed, ticks, finished_at, language = RECORD.unpack(
+            self._reader.read(RECORD.size)
+        )
+        return Run(seed, score, passed, ticks, finished_at, language.rstrip(b"\0").decode("ascii"))
+
+    def add(self, run: Run) -> None:
+        # Packed here, so a run that does not fit a record fails in the caller instead of the writer
+        try:
+            record: bytes = RECORD.pack(
+                run.seed,
+                run.score,
+                run.passed_platforms,
+                run.ticks,
+                run.finished_at,
+                language_code(run.language).encode("ascii"),
+            )
+        except struct.error as error:
+            raise ValueError(f"Run does not fit a record: {error}") from None
+        _insert(self._top, run.score, self.count, self.top_k)
+        self.count += 1
+        self._queue.put((run.score, record))
+
+    def best(self) -> int:
+        """Highest score ever recorded, or 0 for an empty history."""
+        return -self._top[0][0] if self._top else 0
+
+    def top(self, k: int = 10) -> List[Run]:
+        """The k best runs, best first; k is capped at top_k."""
+        self.flush()
+        return [self.read(number) for _, number in self._top[:k]]
+
+    def _write_loop(self) -> None:
+        while True:
+            item: Optional[Tuple[int, bytes]] = self._queue.get()
+            batch: List[Tuple[int, bytes]] = []
+            stop: bool = item is None
+            if item is not None:
+                batch.append(item)
+            # Take everything else already queued so it goes out in the same write
+            while not stop:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+            try:
+                if batch:
+                    self._write(batch)
+            except Exception:
+                logging.exception("Could not write run history %s", self.path)
+            finally:
+                # Always, so flush() cannot block forever on a batch that failed
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[Tuple[int, bytes]]) -> None:
+        start: float = time.perf_counter()
+        first: int = (self._file.tell() - HEADER.size) // RECORD.size
+        written_top: List[Tuple[int, int]] = list(self._written_top)
+        for offset, (score, _) in enumerate(batch):
+            _insert(written_top, score, first + offset, self.top_k)
+        try:
+            self._file.write(b"".join(record for _, record in batch))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._written_top = written_top  # The index only lists runs that made it to disk
+            self._write_index(first + len(batch))
+        except OSError as error:
+            logging.error("Could not write run history %s: %s", self.path, error)
+            return
+        logging.debug(
+            "Wrote %d run(s) to %s in %.1f ms",
+            len(batch),
+            self.path,
+            (time.perf_counter() - start) * 1000,
+        )
+
+    def _write_index(self, covered: int) -> None:
+        data: bytearray = bytearray(
+            INDEX_HEADER.pack(INDEX_MAGIC, VERSION, covered, len(self._written_top))
+        )
+        for negative_score, number in self._written_top:
+            data += INDEX_ENTRY.pack(-negative_score, number)
+        # Replace the index in one step so a crash leaves either the old or the new one
+        temporary_path: str = f"{self.index_path}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.index_path)
+
+    def flush(self) -> None:
+        """Block until every added run is on disk."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._file.close()
+        self._reader.close()
@@ -0,0 +1,290 @@
+import atexit
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Optional, Tuple
+
+from constants import PLATFORM_HEIGHT, PLATFORM_WIDTH, PLAYER_IMAGE, SCREEN_HEIGHT, SCREEN_WIDTH
+from game_state import GameState
+from platform_index import PlatformIndex
+from platform_sprite import Platform
+from world import World
+
+# Layout: header, session record, one platform record per live platform
+# lowest first, plus one for the last platform jumped on if it has already
+# been culled, then the buffered (x, y) positions of the current chunk.
+# A mid-game snapshot is a few hundred bytes.
+MAGIC: bytes = b"FJSS"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sB")  # magic, version
+# World seed, next chunk, ticks, score, high score, passed platforms, next platform ID,
+# player x, y, previous x, y, altitude, vertical speed, facing right,
+# camera offset, previous offset, ID of the player's last platform and of the
+# last one jumped on (0 for none), platform count, buffered count, culled last-jumped flag
+SESSION: struct.Struct = struct.Struct("<qIIIIIIiiiidd?ddIIHHB")
+PLATFORM: struct.Struct = struct.Struct("<iiI?")  # x, y, ID, passed; all platforms are the same size
+POSITION: struct.Struct = struct.Struct("<ii")  # x, y of a platform not placed yet
+
+
+def snapshot(state: GameState) -> bytearray:
+    """Serialize everything step() depends on into a compact binary snapshot.
+
+    The level's randomness needs no RNG state of its own: every chunk is
+    drawn from an RNG seeded with (seed, index), so the seed, the index of
+    the next chunk and the platforms of the current one that have not been
+    placed yet are enough to generate the rest of the level exactly as the
+    original session would have.
+    """
+    world: World = state.world
+    player = state.player
+    platforms: PlatformIndex = state.platforms
+    jumped: Optional[Platform] = state.last_platform_jumped
+    culled: bool = jumped is not None and all(platform is not jumped for platform in platforms)
+    last: Optional[Platform] = player.last_platform
+
+    data: bytearray = bytearray(
+        HEADER.size
+        + SESSION.size
+        + (len(platforms) + culled) * PLATFORM.size
+        + len(world.buffered) * POSITION.size
+    )
+    HEADER.pack_into(data, 0, MAGIC, VERSION)
+    SESSION.pack_into(
+        data,
+        HEADER.size,
+        world.seed,
+        world.next_chunk,
+        state.ticks,
+        state.score,
+        state.high_score,
+        state.passed_platforms,
+        world.next_platform_id,
+        player.rect.x,
+        player.rect.y,
+        player.previous_topleft[0],
+        player.previous_topleft[1],
+        player.altitude,
+        state.player_y_change,
+        player.facing_right,
+        state.camera.offset_y,
+        state.camera.previous_offset_y,
+        last.id if last is not None else 0,
+        jumped.id if jumped is not None else 0,
+        len(platforms),
+        len(world.buffered),
+        culled,
+    )
+    offset: int = HEADER.size + SESSION.size
+    for platform in platforms:
+        PLATFORM.pack_into(data, offset, platform.rect.x, platform.rect.y, platform.id, platform.passed)
+        offset += PLATFORM.size
+    if culled:
+        PLATFORM.pack_into(data, offset, jumped.rect.x, jumped.rect.y, jumped.id, jumped.passed)
+        offset += PLATFORM.size
+    for x, y in world.buffered:
+        POSITION.pack_into(data, offset, x, y)
+        offset += POSITION.size
+    return data
+
+
+def restore(
+    data: bytes,
+    state: Optional[GameState] = None,
+    image_path: Optional[str] = PLAYER_IMAGE,
+    prefetch: bool = False,
+) -> GameState:
+    """Rebuild a session from a snapshot, continuing exactly where it was taken.
+
+    Given a state, the snapshot is written into it: its player, camera,
+    platform index and, for the same seed, its world are kept, and its
+    platforms are released to the world and overwritten by the restored
+    ones, so forking many simulations from one snapshot this way allocates
+    next to nothing. Without a state a new one is created first.
+    Platform IDs are numbered per World, so the world's next ID is
+    restored as well.
+    """
+    view: memoryview = memoryview(data)
+    magic, version = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a Frog Jump snapshot or unsupported version")
+    (
+        seed,
+        next_chunk,
+        ticks,
+        score,
+        high_score,
+        passed_platforms,
+        next_id,
+        x,
+        y,
+        previous_x,
+        previous_y,
+        altitude,
+        y_change,
+        facing_right,
+        offset_y,
+        previous_offset_y,
+        last_id,
+        jumped_id,
+        count,
+        buffered,
+        culled,
+    ) = SESSION.unpack_from(view, HEADER.size)
+    start: int = HEADER.size + SESSION.size
+    end: int = start + (count + culled) * PLATFORM.size
+    if len(view) != end + buffered * POSITION.size:
+        raise ValueError("Snapshot is truncated")
+
+    if state is None:
+        state = GameState(seed=seed, high_score=high_score, image_path=image_path, prefetch=prefetch)
+    if state.world.seed != seed:
+        state.world = World(SCREEN_WIDTH, SCREEN_HEIGHT, seed, prefetch=state.world.prefetch)
+    state.world.seek(next_chunk, POSITION.iter_unpack(view[end:]))
+
+    # Hand the platforms being replaced to the world, including a culled last-jumped one
+    world: World = state.world
+    platforms: PlatformIndex = state.platforms
+    replaced: Optional[Platform] = state.last_platform_jumped
+    while platforms:
+        platform: Platform = platforms.pop_lowest()
+        if platform is replaced:
+            replaced = None
+        world.release(platform)
+    if replaced is not None:
+        world.release(replaced)
+
+    player = state.player
+    player.last_platform = None
+    state.last_platform_jumped = None
+    for index, (p_x, p_y, platform_id, passed) in enumerate(PLATFORM.iter_unpack(view[start:end])):
+        platform = Platform.restore(
+            p_x, p_y, PLATFORM_WIDTH, PLATFORM_HEIGHT, platform_id, passed, world.reusable()
+        )
+        if index < count:
+            platforms.add(platform)
+            if platform_id == last_id:
+                player.last_platform = platform
+        if platform_id == jumped_id:
+            state.last_platform_jumped = platform
+    world.next_platform_id = next_id
+
+    player.rect.topleft = (x, y)
+    player.previous_topleft = (previous_x, previous_y)
+    player.altitude = altitude
+    player.facing_right = facing_right
+    player.image = player.sprite.flipped if facing_right else player.sprite.image
+    state.camera.offset_y = offset_y
+    state.camera.previous_offset_y = previous_offset_y
+    state.player_y_change = y_change
+    state.ticks = ticks
+    state.score = score
+    state.high_score = high_score
+    state.passed_platforms = passed_platforms
+    return state
+
+
+class SnapshotFile:
+    """Keeps the latest snapshot of a live session on disk, for resuming after a restart.
+
+    save() only hands the snapshot over; a background thread writes it to
+    a temporary file and moves that over the previous one, so a crash or
+    power cut leaves either the old snapshot or the new one. When
+    snapshots arrive faster than they are written, only the newest is.
+    clear() removes the file once the session is over, so the next launch
+    starts a new one.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue()  # b"" clears the file, None stops
+        self._writer: threading.Thread = threading.Thread(
+            target=self._write_loop, name="snapshots", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def load(self) -> Optional[bytes]:
+        """The snapshot left by the previous launch, or None if there is none."""
+        try:
+            with open(self.path, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def save(self, data: bytes) -> None:
+        self._queue.put(bytes(data))
+
+    def clear(self) -> None:
+        self._queue.put(b"")
+
+    def _write_loop(self) -> None:
+        while True:
+            latest: Optional[bytes] = self._queue.get()
+            stop: bool = latest is None
+            # Only the newest snapshot matters; skip the ones it replaces
+            while not stop:
+                try:
+                    item: Optional[bytes] = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    latest = item
+            if latest is not None:
+                self._write(latest)
+            if stop:
+                return
+
+    def _write(self, data: bytes) -> None:
+        start: float = time.perf_counter()
+        try:
+            if not data:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            temporary_path: str = f"{self.path}.tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.path)
+        except OSError as error:
+            logging.error("Could not write session snapshot %s: %s", self.path, error)
+            return
+        logging.debug(
+            "Wrote %d byte snapshot to %s in %.1f ms", len(data), self.path, (time.perf_counter() - start) * 1000
+        )
+
+    def close(self) -> None:
+        """Write the last snapshot saved and stop the writer."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+
+def benchmark(ticks: int = 600, forks: int = 10_000) -> Tuple[int, float, float]:
+    """Return the snapshot size and microseconds per snapshot and per in-place restore."""
+    state: GameState = GameState(seed=1, image_path=None)
+    for tick in range(ticks):
+        state.step(1 if tick // 40 % 2 else -1)
+    data: bytearray = snapshot(state)
+    fork: GameState = restore(data, image_path=None)
+
+    start: float = time.perf_counter()
+    for _ in range(forks):
+        snapshot(state)
+    taken: float = (time.perf_counter() - start) / forks * 1e6
+    start = time.perf_counter()
+    for _ in range(forks):
+        restore(data, fork)
+    restored: float = (time.perf_counter() - start) / forks * 1e6
+    return len(data), taken, restored
+
+
+if __name__ == "__main__":
+    size, taken, restored = benchmark()
+    print(f"Snapshot: {size} bytes, {taken:.1f} us to take, {restored:.1f} us to restore in place")
@@ -0,0 +1,20 @@
+import logging
+import time
+from typing import Dict
+
+# Imported by main before anything else, so the startup report covers pygame's import too
+launch_time: float = time.perf_counter()
+
+startup_times: Dict[str, float] = {}  # Seconds from launch to each startup step
+
+
+def mark_startup(step: str) -> None:
+    # Only the first occurrence of a step counts; the first frame ends the report
+    if step in startup_times:
+        return
+    startup_times[step] = time.perf_counter() - launch_time
+    if step == "first frame":
+        logging.info(
+            "Startup: %s.",
+            ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in startup_times.items()),
+        )
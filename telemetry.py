@@ -0,0 +1,375 @@
+import argparse
+import asyncio
+import atexit
+import logging
+import struct
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import pygame
+
+from assets import assets
+from constants import (
+    DARK_BROWN,
+    FPS,
+    LIGHT_BLUE,
+    PLATFORM_HEIGHT,
+    PLATFORM_WIDTH,
+    PLAYER_IMAGE,
+    PLAYER_SIZE,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
+from game_logging import AggregatedLog
+from game_state import GameState
+from platform_index import PlatformIndex
+from text_cache import render_text
+
+# Stream layout: every message is a little-endian uint32 length followed by
+# a payload that starts with its kind and the tick it describes. A keyframe
+# carries the whole visible state; a delta carries only the fields flagged
+# in its mask plus the platforms removed and added since the previous
+# message. Platforms never move, so they are sent once, when they appear.
+KEYFRAME: int = 0
+DELTA: int = 1
+LENGTH: struct.Struct = struct.Struct("<I")
+MESSAGE_HEADER: struct.Struct = struct.Struct("<BI")  # kind, tick
+KEYFRAME_BODY: struct.Struct = struct.Struct("<iifIH")  # player x, y, offset_y, score, platforms
+PLATFORM: struct.Struct = struct.Struct("<Iii")  # id, x, y
+PLATFORM_CHANGES: struct.Struct = struct.Struct("<HH")  # removed, added
+PLATFORM_ID: struct.Struct = struct.Struct("<I")
+
+# Delta mask bits and the field each one carries, in this order
+PLAYER_X: int = 1
+PLAYER_Y: int = 2
+OFFSET_Y: int = 4
+SCORE: int = 8
+PLATFORMS: int = 16
+MASK: struct.Struct = struct.Struct("<B")
+FIELDS: Tuple[Tuple[int, struct.Struct], ...] = (
+    (PLAYER_X, struct.Struct("<i")),
+    (PLAYER_Y, struct.Struct("<i")),
+    (OFFSET_Y, struct.Struct("<f")),
+    (SCORE, struct.Struct("<I")),
+)
+
+QUEUE_SIZE: int = 120  # Messages a spectator may fall behind, two seconds of ticks
+
+PlatformRecord = Tuple[int, int, int]  # id, x, y
+
+
+def parse_address(address: str) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+    """Split HOST:PORT, :PORT or unix:PATH into (host, port, path)."""
+    if address.startswith("unix:"):
+        return None, None, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port), None
+
+
+class _Spectator:
+    __slots__ = ("queue", "needs_keyframe")
+
+    def __init__(self, size: int):
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(size)
+        self.needs_keyframe: bool = True
+
+
+class TelemetryServer:
+    """Publishes the state of the running session to local spectators.
+
+    The asyncio server runs on its own thread. publish() is called by the
+    game after each tick; it compares the state with the previous tick,
+    packs only what changed and hands the message to the server thread
+    without waiting. Every spectator has a bounded queue: when it is full
+    the messages waiting in it are dropped for that spectator alone and
+    replaced by a keyframe, so it skips ahead to the current state. A slow
+    or stuck spectator therefore misses frames but never holds up the game.
+    """
+
+    def __init__(self, address: str, queue_size: int = QUEUE_SIZE):
+        self.address: str = address
+        self.queue_size: int = queue_size
+        self._spectators: Set[_Spectator] = set()  # Only changed on the server thread
+        self._dropped_log: AggregatedLog = AggregatedLog("telemetry messages dropped")
+
+        # State as of the previous publish(), compared against to build deltas
+        self._state: Optional[GameState] = None
+        self._fields: List[float] = [0, 0, 0.0, 0]
+        self._platforms: Tuple[PlatformRecord, ...] = ()
+        self._platforms_key: Tuple[int, int, int] = (0, 0, 0)  # lowest id, highest id, count
+
+        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ready: threading.Event = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run, name="telemetry", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        logging.info("Telemetry stream listening on %s.", address)
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        host, port, path = parse_address(self.address)
+        try:
+            if path is not None:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_unix_server(self._serve, path)
+                )
+            else:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_server(self._serve, host, port)
+                )
+        except OSError as error:
+            self._error = error
+            self._ready.set()
+            return
+        self._ready.set()
+        self._loop.run_forever()
+        self._server.close()
+        tasks: Set["asyncio.Task[None]"] = asyncio.all_tasks(self._loop)
+        for task in tasks:
+            task.cancel()
+        self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self._loop.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        spectator: _Spectator = _Spectator(self.queue_size)
+        self._spectators.add(spectator)
+        peer: str = str(writer.get_extra_info("peername") or self.address)
+        logging.info("Spectator connected from %s.", peer)
+        try:
+            while True:
+                writer.write(await spectator.queue.get())
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._spectators.discard(spectator)
+            writer.close()
+            logging.info("Spectator %s disconnected.", peer)
+
+    def _broadcast(
+        self,
+        delta: Optional[bytes],
+        tick: int,
+        fields: List[float],
+        platforms: Tuple[PlatformRecord, ...],
+        resync: bool,
+    ) -> None:
+        # Runs on the server thread; the keyframe is only packed if someone needs it
+        keyframe: Optional[bytes] = None
+        for spectator in self._spectators:
+            if spectator.queue.full():
+                # Skip this spectator ahead: drop what it has not read yet and resync it
+                dropped: int = spectator.queue.qsize()
+                while not spectator.queue.empty():
+                    spectator.queue.get_nowait()
+                self._dropped_log.record(dropped)
+                spectator.needs_keyframe = True
+            if resync or spectator.needs_keyframe:
+                if keyframe is None:
+                    keyframe = self._keyframe(tick, fields, platforms)
+                spectator.queue.put_nowait(keyframe)
+                spectator.needs_keyframe = False
+            elif delta is not None:
+                spectator.queue.put_nowait(delta)
+
+    def publish(self, state: GameState) -> None:
+        """Send what changed in `state` since the previous call."""
+        player_rect: pygame.Rect = state.player.rect
+        fields: List[float] = [
+            player_rect.x,
+            player_rect.y,
+            state.camera.offset_y,
+            state.score,
+        ]
+
+        # Platforms only change when one is generated or culled
+        platforms: PlatformIndex = state.platforms
+        key: Tuple[int, int, int] = (
+            (platforms.lowest().id, platforms.highest().id, len(platforms)) if platforms else (0, 0, 0)
+        )
+        new_session: bool = state is not self._state
+        previous_platforms: Tuple[PlatformRecord, ...] = self._platforms
+        platforms_changed: bool = new_session or key != self._platforms_key
+        if platforms_changed:
+            self._platforms = tuple(
+                (platform.id, platform.rect.x, platform.rect.y) for platform in platforms
+            )
+            self._platforms_key = key
+        previous_fields: List[float] = self._fields
+        self._fields = fields
+        self._state = state
+        if not self._spectators:
+            return
+
+        # Platform ids restart with every session, so a new one resyncs everyone
+        delta: Optional[bytes] = None
+        if not new_session:
+            delta = self._delta(
+                state.ticks,
+                previous_fields,
+                fields,
+                previous_platforms if platforms_changed else None,
+                self._platforms,
+            )
+        self._loop.call_soon_threadsafe(
+            self._broadcast, delta, state.ticks, fields, self._platforms, new_session
+        )
+
+    @staticmethod
+    def _keyframe(
+        tick: int, fields: List[float], platforms: Tuple[PlatformRecord, ...]
+    ) -> bytes:
+        body: bytearray = bytearray(MESSAGE_HEADER.pack(KEYFRAME, tick))
+        body += KEYFRAME_BODY.pack(*fields, len(platforms))
+        for record in platforms:
+            body += PLATFORM.pack(*record)
+        return LENGTH.pack(len(body)) + body
+
+    @staticmethod
+    def _delta(
+        tick: int,
+        previous_fields: List[float],
+        fields: List[float],
+        previous_platforms: Optional[Tuple[PlatformRecord, ...]],
+        platforms: Tuple[PlatformRecord, ...],
+    ) -> Optional[bytes]:
+        mask: int = 0
+        body: bytearray = bytearray()
+        for (bit, field), old, new in zip(FIELDS, previous_fields, fields):
+            if old != new:
+                mask |= bit
+                body += field.pack(new)
+        if previous_platforms is not None:
+            old_ids: Set[int] = {record[0] for record in previous_platforms}
+            new_ids: Set[int] = {record[0] for record in platforms}
+            removed: List[int] = [record[0] for record in previous_platforms if record[0] not in new_ids]
+            added: List[PlatformRecord] = [record for record in platforms if record[0] not in old_ids]
+            if removed or added:
+                mask |= PLATFORMS
+                body += PLATFORM_CHANGES.pack(len(removed), len(added))
+                for platform_id in removed:
+                    body += PLATFORM_ID.pack(platform_id)
+                for record in added:
+                    body += PLATFORM.pack(*record)
+        if not mask:
+            return None  # Nothing a spectator could see has changed
+        payload: bytes = MESSAGE_HEADER.pack(DELTA, tick) + MASK.pack(mask) + body
+        return LENGTH.pack(len(payload)) + payload
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+
+class SpectatorState:
+    """A session rebuilt from the telemetry stream on the spectator's side."""
+
+    def __init__(self) -> None:
+        self.tick: int = 0
+        self.player_x: int = 0
+        self.player_y: int = 0
+        self.offset_y: float = 0.0
+        self.score: int = 0
+        self.platforms: Dict[int, Tuple[int, int]] = {}  # id -> (x, y)
+        self.synced: bool = False  # Set by the first keyframe; deltas before it are ignored
+
+    def apply(self, payload: bytes) -> None:
+        kind, tick = MESSAGE_HEADER.unpack_from(payload)
+        offset: int = MESSAGE_HEADER.size
+        if kind == KEYFRAME:
+            self.player_x, self.player_y, self.offset_y, self.score, count = (
+                KEYFRAME_BODY.unpack_from(payload, offset)
+            )
+            offset += KEYFRAME_BODY.size
+            self.platforms.clear()
+            for _ in range(count):
+                platform_id, x, y = PLATFORM.unpack_from(payload, offset)
+                offset += PLATFORM.size
+                self.platforms[platform_id] = (x, y)
+            self.synced = True
+        elif kind == DELTA and self.synced:
+            (mask,) = MASK.unpack_from(payload, offset)
+            offset += MASK.size
+            values: List[float] = [self.player_x, self.player_y, self.offset_y, self.score]
+            for index, (bit, field) in enumerate(FIELDS):
+                if mask & bit:
+                    (values[index],) = field.unpack_from(payload, offset)
+                    offset += field.size
+            self.player_x, self.player_y, self.offset_y, self.score = values
+            if mask & PLATFORMS:
+                removed, added = PLATFORM_CHANGES.unpack_from(payload, offset)
+                offset += PLATFORM_CHANGES.size
+                for _ in range(removed):
+                    (platform_id,) = PLATFORM_ID.unpack_from(payload, offset)
+                    offset += PLATFORM_ID.size
+                    self.platforms.pop(platform_id, None)
+                for _ in range(added):
+                    platform_id, x, y = PLATFORM.unpack_from(payload, offset)
+                    offset += PLATFORM.size
+                    self.platforms[platform_id] = (x, y)
+        self.tick = tick
+
+
+async def spectate(address: str) -> None:
+    """Reference client: follow a telemetry stream and draw it in a window."""
+    host, port, path = parse_address(address)
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    pygame.display.init()
+    pygame.font.init()
+    screen: pygame.Surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(f"Frog Jump spectator - {address}")
+
+    player_image: pygame.Surface = assets.sprite(PLAYER_IMAGE, (PLAYER_SIZE, PLAYER_SIZE)).image
+    state: SpectatorState = SpectatorState()
+
+    async def receive() -> None:
+        while True:
+            (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+            state.apply(await reader.readexactly(length))
+
+    receiver: "asyncio.Task[None]" = asyncio.ensure_future(receive())
+    try:
+        while not receiver.done():
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            offset: int = int(-state.offset_y)
+            screen.fill(LIGHT_BLUE)
+            for x, y in state.platforms.values():
+                screen.fill(DARK_BROWN, (x, y + offset, PLATFORM_WIDTH, PLATFORM_HEIGHT))
+            screen.blit(player_image, (state.player_x, state.player_y + offset))
+            screen.blit(render_text(f"{state.score}", 36, (0, 0, 0)), (10, 10))
+            pygame.display.update()
+            await asyncio.sleep(1 / FPS)
+    finally:
+        receiver.cancel()
+        writer.close()
+        pygame.quit()
+    if receiver.done() and not receiver.cancelled() and receiver.exception() is not None:
+        logging.info("Telemetry stream ended: %s", receiver.exception())
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Watch a Frog Jump session started with --telemetry"
+    )
+    parser.add_argument(
+        "address",
+        nargs="?",
+        default="127.0.0.1:8765",
+        help="HOST:PORT or unix:PATH the game publishes on (default: 127.0.0.1:8765)",
+    )
+    args: argparse.Namespace = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(spectate(args.address))
@@ -0,0 +1,42 @@
+import itertools
+from typing import Iterator, List
+
+import numpy as np
+import pytest
+
+import constants
+from batch_sim import BatchSimulator
+from game_state import GameState
+
+SEEDS: List[int] = list(range(8))
+TICKS: int = 600
+
+
+def directions(seed: int) -> Iterator[int]:
+    # A different zigzag per seed, so the sessions land, score and fall at different times
+    return itertools.cycle([1] * (20 + seed * 5) + [0] * 10 + [-1] * (30 + seed * 3))
+
+
+@pytest.mark.parametrize("gravity, jump_velocity", [(0.5, -15), (0.45, -14)])
+def test_batch_matches_game_state_under_overridden_physics(
+    monkeypatch: pytest.MonkeyPatch, gravity: float, jump_velocity: int
+) -> None:
+    monkeypatch.setattr(constants, "GRAVITY", gravity)
+    monkeypatch.setattr(constants, "JUMP_VELOCITY", jump_velocity)
+
+    states: List[GameState] = [GameState(seed=seed, image_path=None) for seed in SEEDS]
+    batch: BatchSimulator = BatchSimulator(SEEDS)
+    inputs: List[Iterator[int]] = [directions(seed) for seed in SEEDS]
+    for _ in range(TICKS):
+        tick: np.ndarray = np.array([next(source) for source in inputs])
+        for state, direction in zip(states, tick.tolist()):
+            if not state.game_over:
+                state.step(direction)
+        batch.step(tick)
+
+    for i, state in enumerate(states):
+        assert (batch.x[i], batch.y[i]) == state.player.rect.topleft
+        assert batch.y_change[i] == state.player_y_change
+        assert batch.score[i] == state.score
+        assert batch.ticks[i] == state.ticks
+        assert batch.game_over[i] == state.game_over
@@ -0,0 +1,36 @@
+from typing import Tuple
+
+import pytest
+
+import constants
+from constants import CHUNK_HEIGHT, SCREEN_HEIGHT, SCREEN_WIDTH
+from world import World
+
+
+@pytest.fixture
+def narrow_gaps(monkeypatch: pytest.MonkeyPatch) -> Tuple[int, int]:
+    # Heights such as 310 px fit neither two gaps (at most 300) nor three (at least 390)
+    min_distance, max_distance = 130, 150
+    monkeypatch.setattr(constants, "MIN_PLATFORM_DISTANCE", min_distance)
+    monkeypatch.setattr(constants, "MAX_PLATFORM_DISTANCE", max_distance)
+    return min_distance, max_distance
+
+
+def test_narrow_gap_range_tiles_every_chunk(narrow_gaps: Tuple[int, int]) -> None:
+    min_distance, max_distance = narrow_gaps
+    for seed in range(50):
+        world: World = World(SCREEN_WIDTH, SCREEN_HEIGHT, seed)
+        for index in range(5):
+            chunk = world.generate_chunk(index)
+            ys = [y for _, y in chunk] + [world.base_y - (index + 1) * CHUNK_HEIGHT]
+            gaps = [lower - upper for lower, upper in zip(ys, ys[1:])]
+            assert all(min_distance <= gap <= max_distance for gap in gaps)
+
+
+def test_chunk_height_that_cannot_be_split_is_rejected(narrow_gaps: Tuple[int, int]) -> None:
+    min_distance, max_distance = narrow_gaps
+    # Just over two of the largest gaps, and short of three of the smallest
+    chunk_height: int = 2 * max_distance + 10
+    assert chunk_height < 3 * min_distance
+    with pytest.raises(ValueError):
+        World(SCREEN_WIDTH, SCREEN_HEIGHT, chunk_height=chunk_height)
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+_fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+
+def get_font(size: int, name: Optional[str] = None) -> pygame.font.Font:
+    # Fonts are loaded once per (file, size) and shared by every screen
+    key: Tuple[Optional[str], int] = (name, size)
+    font: Optional[pygame.font.Font] = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """Least-recently-used cache of rendered text surfaces.
+
+    Entries are keyed by (font file, size, text, color, antialias), so the
+    same string drawn in the same style is rasterized only once. Returned
+    surfaces are shared and must not be drawn on.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries: int = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+    def render(
+        self,
+        text: str,
+        size: int,
+        color: Tuple[int, int, int],
+        antialias: bool = True,
+        name: Optional[str] = None,
+    ) -> pygame.Surface:
+        key: tuple = (name, size, text, color, antialias)
+        surface: Optional[pygame.Surface] = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = get_font(size, name).render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+
+
+text_cache: TextCache = TextCache()
+
+
+def render_text(
+    text: str,
+    size: int,
+    color: Tuple[int, int, int],
+    antialias: bool = True,
+    name: Optional[str] = None,
+) -> pygame.Surface:
+    return text_cache.render(text, size, color, antialias, name)
+
+
+def clear_caches() -> None:
+    # Needed after pygame.quit(), which invalidates every loaded font
+    text_cache.clear()
+    _fonts.clear()
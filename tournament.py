@@ -0,0 +1,311 @@
+import argparse
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import constants
+from constants import PLAYER_SPEED
+from game_state import GameState, run_headless
+from platform_sprite import Platform
+from world import World
+
+Policy = Callable[[GameState], int]
+PolicyFactory = Callable[[int], Policy]  # Builds a policy for one session from its seed
+
+# Tunable constants and the command line option that sweeps each of them
+PARAMETERS: Dict[str, str] = {
+    "MIN_PLATFORM_DISTANCE": "min_distance",
+    "MAX_PLATFORM_DISTANCE": "max_distance",
+    "GRAVITY": "gravity",
+    "JUMP_VELOCITY": "jump_velocity",
+}
+
+SURVIVAL_SECONDS: Tuple[int, ...] = (10, 30, 60, 120, 300)  # Points reported on the survival curve
+PERCENTILES: Tuple[int, ...] = (50, 90, 99)
+
+
+def idle_policy(seed: int) -> Policy:
+    return lambda state: 0
+
+
+def random_policy(seed: int) -> Policy:
+    # Holds a random direction for a random number of ticks, like a player mashing keys
+    rng: random.Random = random.Random(seed)
+    held: List[int] = [0, 0]  # direction, ticks left
+
+    def policy(state: GameState) -> int:
+        if held[1] == 0:
+            held[0] = rng.choice((-1, 0, 1))
+            held[1] = rng.randint(5, 60)
+        held[1] -= 1
+        return held[0]
+
+    return policy
+
+
+def climber_policy(seed: int) -> Policy:
+    # Steers towards the nearest platform above the player's feet, or once
+    # falling, towards the nearest one below them that it will land on
+    def policy(state: GameState) -> int:
+        player_rect = state.player.rect
+        above: Optional[Platform] = None
+        below: Optional[Platform] = None
+        for platform in state.platforms:
+            if platform.rect.top < player_rect.bottom:
+                if above is None or platform.rect.top > above.rect.top:
+                    above = platform
+            elif below is None or platform.rect.top < below.rect.top:
+                below = platform
+        target: Optional[Platform] = (
+            below if state.player_y_change > 0 and below is not None else above
+        )
+        if target is None:
+            return 0
+        dx: int = target.rect.centerx - player_rect.centerx
+        if abs(dx) < PLAYER_SPEED:
+            return 0
+        return 1 if dx > 0 else -1
+
+    return policy
+
+
+POLICIES: Dict[str, PolicyFactory] = {
+    "idle": idle_policy,
+    "random": random_policy,
+    "climber": climber_policy,
+}
+
+
+def resolve_policy(name: str) -> PolicyFactory:
+    """Look up a built-in policy, or import one given as "module:function"."""
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, _, function_name = name.partition(":")
+    if not function_name:
+        raise ValueError(
+            f"Unknown policy {name!r}; use one of {', '.join(POLICIES)} or module:function"
+        )
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def play_batch(task: Tuple[int, str, Dict[str, float], int, int, int]) -> Tuple[int, dict]:
+    """Play one batch of seeded sessions in a worker and return its histograms.
+
+    Only counts go back to the parent, never individual sessions, so the
+    data sent between processes does not grow with the batch size.
+    """
+    index, policy_name, parameters, first_seed, sessions, max_ticks = task
+    for name, value in parameters.items():
+        setattr(constants, name, value)
+    factory: PolicyFactory = resolve_policy(policy_name)
+
+    scores: Counter = Counter()
+    seconds: Counter = Counter()  # Session length in whole seconds of game time
+    survived: int = 0
+    for seed in range(first_seed, first_seed + sessions):
+        state: GameState = run_headless(factory(seed), seed, max_ticks)
+        scores[state.score] += 1
+        seconds[state.ticks // constants.TICK_RATE] += 1
+        if not state.game_over:
+            survived += 1
+    return index, {"scores": scores, "seconds": seconds, "survived": survived}
+
+
+class Aggregate:
+    """Running score and survival distributions for one parameter set."""
+
+    def __init__(self, parameters: Dict[str, float], max_ticks: int):
+        self.parameters: Dict[str, float] = parameters
+        self.max_ticks: int = max_ticks
+        self.sessions: int = 0
+        self.survived: int = 0  # Sessions still alive at max_ticks
+        self.scores: Counter = Counter()
+        self.seconds: Counter = Counter()
+
+    def merge(self, batch: dict) -> None:
+        self.scores.update(batch["scores"])
+        self.seconds.update(batch["seconds"])
+        self.survived += batch["survived"]
+        self.sessions += sum(batch["scores"].values())
+
+    @staticmethod
+    def _percentile(histogram: Counter, total: int, percentile: int) -> int:
+        rank: float = total * percentile / 100
+        seen: int = 0
+        for value in sorted(histogram):
+            seen += histogram[value]
+            if seen >= rank:
+                return value
+        return 0
+
+    def summary(self) -> dict:
+        total: int = self.sessions
+        divisor: int = max(total, 1)  # With no sessions played, e.g. -n 0, everything is reported as 0
+        report: dict = {
+            "parameters": self.parameters,
+            "sessions": total,
+            "score_mean": sum(score * count for score, count in self.scores.items()) / divisor,
+            "score_max": max(self.scores, default=0),
+            "survived_max_ticks": self.survived / divisor,
+            "seconds_mean": sum(second * count for second, count in self.seconds.items()) / divisor,
+        }
+        for percentile in PERCENTILES:
+            report[f"score_p{percentile}"] = self._percentile(self.scores, total, percentile)
+        report["alive_after_seconds"] = {
+            str(limit): sum(count for second, count in self.seconds.items() if second >= limit)
+            / divisor
+            for limit in SURVIVAL_SECONDS
+            if limit * constants.TICK_RATE <= self.max_ticks  # Later points were cut off by max_ticks
+        }
+        return report
+
+
+def parse_values(text: str, kind: type) -> List:
+    return [kind(value) for value in text.split(",")]
+
+
+def level_error(parameters: Dict[str, float]) -> Optional[str]:
+    """Why no level can be generated with these parameters, or None if one can."""
+    defaults: Dict[str, float] = {name: getattr(constants, name) for name in parameters}
+    try:
+        for name, value in parameters.items():
+            setattr(constants, name, value)
+        World(constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
+    except ValueError as error:
+        return str(error)
+    finally:
+        for name, value in defaults.items():
+            setattr(constants, name, value)
+    return None
+
+
+def parameter_grid(args: argparse.Namespace) -> List[Dict[str, float]]:
+    # Points are checked here, since a worker given one that cannot generate a level would fail
+    grid: List[Dict[str, float]] = []
+    for values in itertools.product(*(getattr(args, option) for option in PARAMETERS.values())):
+        parameters: Dict[str, float] = dict(zip(PARAMETERS, values))
+        if parameters["MIN_PLATFORM_DISTANCE"] > parameters["MAX_PLATFORM_DISTANCE"]:
+            print(f"Skipping {parameters}: minimum distance above maximum")
+            continue
+        error: Optional[str] = level_error(parameters)
+        if error is not None:
+            print(f"Skipping {parameters}: {error}")
+            continue
+        grid.append(parameters)
+    return grid
+
+
+def tasks(
+    grid: List[Dict[str, float]], args: argparse.Namespace
+) -> Iterator[Tuple[int, str, Dict[str, float], int, int, int]]:
+    # Every parameter set plays the same seeds, so differences come from the parameters
+    for index, parameters in enumerate(grid):
+        for first in range(0, args.sessions, args.batch_size):
+            count: int = min(args.batch_size, args.sessions - first)
+            yield index, args.policy, parameters, args.seed + first, count, args.max_ticks
+
+
+def run_tournament(args: argparse.Namespace) -> List[dict]:
+    resolve_policy(args.policy)  # Fail here rather than in every worker
+    grid: List[Dict[str, float]] = parameter_grid(args)
+    aggregates: List[Aggregate] = [Aggregate(parameters, args.max_ticks) for parameters in grid]
+    total_batches: int = len(grid) * -(-args.sessions // args.batch_size)
+
+    start: float = time.perf_counter()
+    done: int = 0
+    with multiprocessing.Pool(args.workers) as pool:
+        # Results are folded in as they arrive, in whatever order workers finish
+        for index, batch in pool.imap_unordered(play_batch, tasks(grid, args)):
+            aggregates[index].merge(batch)
+            done += 1
+            if done % max(1, total_batches // 20) == 0 or done == total_batches:
+                elapsed: float = time.perf_counter() - start
+                sessions: int = sum(aggregate.sessions for aggregate in aggregates)
+                print(
+                    f"{done}/{total_batches} batches, {sessions} sessions, "
+                    f"{sessions / elapsed:.0f} sessions/s"
+                )
+    return [aggregate.summary() for aggregate in aggregates]
+
+
+def print_report(summaries: List[dict]) -> None:
+    for summary in sorted(summaries, key=lambda summary: summary["score_mean"], reverse=True):
+        parameters: str = ", ".join(
+            f"{option}={summary['parameters'][name]}" for name, option in PARAMETERS.items()
+        )
+        print(
+            f"{parameters}: mean {summary['score_mean']:.1f}, "
+            f"p50/p90/p99 {summary['score_p50']}/{summary['score_p90']}/{summary['score_p99']}, "
+            f"max {summary['score_max']}, mean length {summary['seconds_mean']:.1f} s, "
+            f"alive at max ticks {summary['survived_max_ticks']:.1%}"
+        )
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Play many headless Frog Jump sessions with a bot over a grid of game parameters"
+    )
+    parser.add_argument(
+        "-p",
+        "--policy",
+        default="climber",
+        help=f"Bot to play with: {', '.join(POLICIES)}, or module:function returning a policy for a seed (default: climber)",
+    )
+    parser.add_argument(
+        "-n", "--sessions", type=int, default=1000, help="Sessions per parameter set (default: 1000)"
+    )
+    parser.add_argument(
+        "--max-ticks",
+        type=int,
+        default=constants.TICK_RATE * 300,
+        help="Stop a session that is still alive after this many ticks (default: 5 minutes)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="First session seed (default: 0)")
+    parser.add_argument(
+        "--min-distance",
+        type=lambda text: parse_values(text, int),
+        default=[constants.MIN_PLATFORM_DISTANCE],
+        help="Comma separated MIN_PLATFORM_DISTANCE values to sweep",
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=lambda text: parse_values(text, int),
+        default=[constants.MAX_PLATFORM_DISTANCE],
+        help="Comma separated MAX_PLATFORM_DISTANCE values to sweep",
+    )
+    parser.add_argument(
+        "--gravity",
+        type=lambda text: parse_values(text, float),
+        default=[constants.GRAVITY],
+        help="Comma separated GRAVITY values to sweep",
+    )
+    parser.add_argument(
+        "--jump-velocity",
+        type=lambda text: parse_values(text, int),
+        default=[constants.JUMP_VELOCITY],
+        help="Comma separated jump velocities (negative is up) to sweep",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Worker processes (default: one per CPU core)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=20, help="Sessions per task sent to a worker (default: 20)"
+    )
+    parser.add_argument("-o", "--output", help="Write the report as JSON to this file")
+    args: argparse.Namespace = parser.parse_args()
+
+    summaries: List[dict] = run_tournament(args)
+    print_report(summaries)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(summaries, file, indent=4)
@@ -1,13 +1,197 @@
-from typing import Tuple
+import functools
+import random
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import constants
+from constants import CHUNK_HEIGHT, PLATFORM_HEIGHT, PLATFORM_WIDTH, PREFETCH_CHUNKS
+from platform_index import PlatformIndex
+from platform_sprite import Platform
+from reachability import ReachabilityTable, reachability_table
+
+POOL_LIMIT: int = 64  # Culled platforms a World keeps for reuse
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _background_executor() -> ThreadPoolExecutor:
+    # One generator thread shared by every World that prefetches
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunks")
+    return _executor
+
+
+@functools.lru_cache(maxsize=None)
+def _splittable(min_gap: int, max_gap: int, height: int, reach: ReachabilityTable) -> bytes:
+    """Byte r is 1 when r pixels can be split into the gaps of a chunk.
+
+    Every gap is between min_gap and max_gap pixels and can be jumped
+    straight up, and the last one can be jumped from any horizontal offset,
+    since the next chunk's first platform can be anywhere. Built once per
+    set of values.
+    """
+    middle: List[int] = [gap for gap in range(min_gap, max_gap + 1) if reach.reachable(gap, 0)]
+    splittable: bytearray = bytearray(height + 1)
+    for remaining in range(height + 1):
+        if min_gap <= remaining <= max_gap and reach.reachable(remaining, reach.max_offset):
+            splittable[remaining] = 1
+        elif any(splittable[remaining - gap] for gap in middle if gap < remaining):
+            splittable[remaining] = 1
+    return bytes(splittable)
 
 
 class World:
-    def __init__(self, width: int, height: int):
+    """Owns world coordinates and generates the level in chunks.
+
+    The level is split into horizontal bands of chunk_height pixels going
+    up from the starting platform. Each chunk starts with a platform on its
+    bottom edge and is drawn from its own RNG seeded with (seed, index), so
+    any chunk can be generated on its own, in any order and on any thread,
+    and always comes out the same. Gaps inside a chunk are picked so that
+    the distance left to the next chunk can still be split into gaps
+    between MIN_PLATFORM_DISTANCE and MAX_PLATFORM_DISTANCE.
+
+    Only chunks that have not been handed out yet are kept, so memory does
+    not grow with the height the player reaches. Platforms culled off the
+    bottom are handed back with release() and reused by populate(), so a
+    long climb allocates no new ones. The pool belongs to this World only,
+    so platforms never move between sessions.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        seed: int = 0,
+        chunk_height: int = CHUNK_HEIGHT,
+        prefetch: bool = False,
+    ):
         self.width: int = width
         self.height: int = height
         self.camera_y: int = 0
+        self.seed: int = seed
+        self.chunk_height: int = chunk_height
+        self.base_y: int = height - PLATFORM_HEIGHT  # Top of the starting platform
+        self.prefetch: bool = prefetch
+        self.next_chunk: int = 0  # Index of the next chunk to hand out
+        self.next_platform_id: int = 1  # Platforms are numbered per World, so sessions never share a counter
+        self._pool: List[Platform] = []  # Released platforms waiting to be placed again
+        self._pending: Dict[int, Future] = {}
+        self._buffer: Deque[Tuple[int, int]] = deque()
+        self.reach: ReachabilityTable = reachability_table(width)
+        self._splittable: bytes = _splittable(
+            constants.MIN_PLATFORM_DISTANCE, constants.MAX_PLATFORM_DISTANCE, chunk_height, self.reach
+        )
+        if not self._closes(constants.MIN_PLATFORM_DISTANCE):
+            raise ValueError(
+                f"Platforms {constants.MIN_PLATFORM_DISTANCE} px apart cannot be reached with this jump"
+            )
+        if not self._gap_fits(chunk_height):
+            raise ValueError(f"Chunk height {chunk_height} cannot be split into platform gaps")
 
     def to_screen_coords(self, world_x: int, world_y: int) -> Tuple[int, int]:
         screen_x: int = world_x
         screen_y: int = world_y - self.camera_y
-        return screen_x, screen_y
\ No newline at end of file
+        return screen_x, screen_y
+
+    def _closes(self, remaining: int) -> bool:
+        # True if `remaining` pixels can be the last gap of a chunk. The next
+        # chunk's first platform can be anywhere, so the gap must be reachable
+        # from every horizontal offset.
+        return (
+            constants.MIN_PLATFORM_DISTANCE <= remaining <= constants.MAX_PLATFORM_DISTANCE
+            and self.reach.reachable(remaining, self.width - PLATFORM_WIDTH)
+        )
+
+    def _gap_fits(self, remaining: int) -> bool:
+        # True if `remaining` pixels can be covered by gaps of allowed size
+        return 0 < remaining < len(self._splittable) and self._splittable[remaining] != 0
+
+    def generate_chunk(self, index: int) -> List[Tuple[int, int]]:
+        """Return the (x, y) top-left corners of the platforms in a chunk, lowest first."""
+        rng: random.Random = random.Random(f"{self.seed}/{index}")
+        bottom: int = self.base_y - index * self.chunk_height
+        top: int = bottom - self.chunk_height
+        x_range: int = self.width - PLATFORM_WIDTH
+        if index == 0:
+            platforms: List[Tuple[int, int]] = [(self.width // 2 - PLATFORM_WIDTH // 2, bottom)]
+        else:
+            platforms = [(rng.randint(0, x_range), bottom)]
+
+        # A gap that is unreachable, or leaves a height the remaining gaps
+        # cannot cover, is drawn again. While the chunk is not closed,
+        # _gap_fits() guarantees such a gap exists, so the draws end. The next
+        # platform is then drawn straight from the offsets the jump reaches at
+        # that gap, which always include 0; with the default physics that is
+        # the whole width.
+        reach: ReachabilityTable = self.reach
+        y: int = bottom
+        x: int = platforms[0][0]
+        while not self._closes(y - top):
+            gap: int = rng.randint(constants.MIN_PLATFORM_DISTANCE, constants.MAX_PLATFORM_DISTANCE)
+            while not (self._gap_fits(y - top - gap) and reach.reachable(gap, 0)):
+                gap = rng.randint(constants.MIN_PLATFORM_DISTANCE, constants.MAX_PLATFORM_DISTANCE)
+            y -= gap
+            widest: int = reach.widest_offset(gap)
+            x = rng.randint(max(0, x - widest), min(x_range, x + widest))
+            platforms.append((x, y))
+        return platforms
+
+    def take_chunk(self) -> List[Tuple[int, int]]:
+        """Hand out the next chunk and queue the ones after it for background generation."""
+        index: int = self.next_chunk
+        self.next_chunk += 1
+        future: Optional[Future] = self._pending.pop(index, None)
+        chunk: List[Tuple[int, int]] = (
+            future.result() if future is not None else self.generate_chunk(index)
+        )
+        if self.prefetch:
+            executor: ThreadPoolExecutor = _background_executor()
+            for ahead in range(index + 1, index + 1 + PREFETCH_CHUNKS):
+                if ahead not in self._pending:
+                    self._pending[ahead] = executor.submit(self.generate_chunk, ahead)
+        return chunk
+
+    @property
+    def buffered(self) -> Deque[Tuple[int, int]]:
+        # Platforms of the last chunk handed out that have not been placed yet
+        return self._buffer
+
+    def seek(self, next_chunk: int, buffered: Iterable[Tuple[int, int]]) -> None:
+        """Continue the level from a saved position, e.g. one taken from a snapshot."""
+        for index in [index for index in self._pending if index < next_chunk]:
+            del self._pending[index]  # Chunks before the position are never handed out
+        self.next_chunk = next_chunk
+        self._buffer.clear()
+        self._buffer.extend(buffered)
+
+    def next_platform(self) -> Tuple[int, int]:
+        if not self._buffer:
+            self._buffer.extend(self.take_chunk())
+        return self._buffer.popleft()
+
+    def populate(self, platforms: PlatformIndex, top: float) -> None:
+        """Add platforms to the index until the highest one is at or above `top`."""
+        while not platforms or platforms.highest().absolute_y > top:
+            p_x, p_y = self.next_platform()
+            platform: Platform
+            if self._pool:
+                platform = self._pool.pop()
+                platform.place(p_x, p_y, self.next_platform_id, absolute_y=p_y)
+            else:
+                platform = Platform(
+                    p_x, p_y, PLATFORM_WIDTH, PLATFORM_HEIGHT, self.next_platform_id, absolute_y=p_y
+                )
+            platforms.add(platform)
+            self.next_platform_id += 1
+
+    def release(self, platform: Platform) -> None:
+        # The caller must not keep any reference to a released platform
+        if len(self._pool) < POOL_LIMIT:
+            self._pool.append(platform)
+
+    def reusable(self) -> Optional[Platform]:
+        """A released platform to overwrite, e.g. when restoring a snapshot, or None."""
+        return self._pool.pop() if self._pool else None